@@ -0,0 +1,123 @@
+"""
+Local stand-in for an HTTP forward proxy, used to test --proxy (ProxyPool) with fake_youtube.py.
+
+Plain http:// URLs are forwarded (no CONNECT, so it can not be used with https://www.youtube.com).
+Faults are injected per request: latency, 429 (throttled egress IP), 503.
+A proxy can also be switched off and on with set_down(), requests are then answered with 503.
+
+Run a proxy alone:
+    python loadtest/fake_youtube.py --port 8000
+    python loadtest/fake_proxy.py --port 3128 --error-429 0.2
+    YTFC_YOUTUBE_URL=http://127.0.0.1:8000 python -m ytfc -i @user1 --proxy http://127.0.0.1:3128
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict
+
+import requests
+
+
+class FakeProxy:
+    def __init__(self, latency: float = 0.0, error_429: float = 0.0, error_5xx: float = 0.0, seed: int = 0):
+        """
+        :param latency: delay added to each response, seconds
+        :param error_429: share of requests answered with 429 Too Many Requests
+        :param error_5xx: share of requests answered with 503
+        :param seed: seed of the fault injection
+        """
+        self.latency = latency
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.down = False
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self.statuses = {}
+        self.server = None
+        self.url = None
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def set_down(self, down: bool) -> None:
+        """Answer all requests with 503 (down) or forward them again."""
+        self.down = down
+
+    def record(self, status: int) -> None:
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start the proxy in a background thread.
+
+        :return: proxy URL, e.g. http://127.0.0.1:3128 (--proxy)
+        """
+        self.server = ThreadingHTTPServer((host, port), type('Handler', (FakeProxyHandler,), {'proxy': self}))
+        self.server.daemon_threads = True
+        self.url = f'http://{host}:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"requests": sum(self.statuses.values()), "statuses": dict(self.statuses)}
+
+
+class FakeProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    proxy = None  # FakeProxy
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        proxy = self.proxy
+        if proxy.latency:
+            time.sleep(proxy.latency)
+        roll = proxy._roll()
+        if proxy.down or roll < proxy.error_5xx:
+            status = 503
+            self._send(status, b'proxy error', 'text/plain')
+        elif roll < proxy.error_5xx + proxy.error_429:
+            status = 429
+            self._send(status, b'too many requests', 'text/plain')
+        elif not self.path.startswith('http://'):
+            status = 400
+            self._send(status, b'absolute http:// URL expected', 'text/plain')
+        else:
+            r = proxy._session.get(self.path, timeout=30)
+            status = r.status_code
+            self._send(status, r.content, r.headers.get('Content-Type', 'application/octet-stream'))
+        proxy.record(status)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local stand-in for an HTTP forward proxy.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3128)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-429', type=float, default=0.0)
+    parser.add_argument('--error-5xx', type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeProxy(latency=args.latency, error_429=args.error_429, error_5xx=args.error_5xx)
+    print(f'Proxy on {fake.start(args.host, args.port)} (press Ctrl+C to stop).')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
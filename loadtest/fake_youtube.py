@@ -0,0 +1,218 @@
+"""
+Local stand-in for YouTube pages and feeds, used by run_loadtest.py.
+
+Routes:
+  /@handle                                  - channel page with the RSS link
+  /feeds/videos.xml?channel_id=UC...         - synthetic Atom feed
+  /feeds/videos.xml?playlist_id=...          - synthetic Atom feed
+  /vi/VIDEO_ID/FRAME                         - small placeholder image (thumbnails)
+
+Faults are injected per request: latency, 404, 429, 5xx, malformed XML.
+
+Run the server alone:
+    python loadtest/fake_youtube.py --port 8000 --latency 0.05 --error-429 0.01
+    YTFC_YOUTUBE_URL=http://127.0.0.1:8000 python -m ytfc -i @user1 UC0000000000000000000001
+    YTFC_YOUTUBE_URL=http://127.0.0.1:8000 YTFC_THUMBNAIL_URL=http://127.0.0.1:8000 \
+        python -m ytfc -i @user1 -s report.html --thumbnails cache
+"""
+import argparse
+import random
+import threading
+import time
+from hashlib import md5
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict
+from urllib.parse import urlparse, parse_qs, unquote
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?{param}={feed_id}"/>
+ <id>yt:{param}:{feed_id}</id>
+ <title>Feed {feed_id}</title>
+ <link rel="alternate" href="https://www.youtube.com/channel/{channel_id}"/>
+ <author>
+  <name>Author {channel_id}</name>
+  <uri>https://www.youtube.com/channel/{channel_id}</uri>
+ </author>
+ <published>2015-01-01T00:00:00+00:00</published>
+{entries}
+</feed>
+"""
+
+ENTRY = """ <entry>
+  <id>yt:video:{video_id}</id>
+  <yt:videoId>{video_id}</yt:videoId>
+  <yt:channelId>{channel_id}</yt:channelId>
+  <title>Video {video_id} of {feed_id}</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+  <author>
+   <name>Author {channel_id}</name>
+   <uri>https://www.youtube.com/channel/{channel_id}</uri>
+  </author>
+  <published>2024-01-{day:02d}T12:00:00+00:00</published>
+  <media:group>
+   <media:title>Video {video_id}</media:title>
+   <media:description>{description}</media:description>
+   <media:community>
+    <media:starRating count="{likes}" average="5.00" min="1" max="5"/>
+    <media:statistics views="{views}"/>
+   </media:community>
+  </media:group>
+ </entry>"""
+
+CHANNEL_PAGE = """<!DOCTYPE html><html><head><title>{handle}</title>
+<link rel="alternate" type="application/rss+xml" title="RSS" href="{base_url}/feeds/videos.xml?channel_id={channel_id}">
+</head><body></body></html>"""
+
+# smallest valid GIF
+IMAGE = b'GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00' \
+        b',\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;'
+
+
+def channel_id_for(value: str) -> str:
+    """Stable UC id for a handle or a playlist."""
+    return 'UC' + md5(value.encode('utf-8')).hexdigest()[:22]
+
+
+class FakeYouTube:
+    def __init__(self, entries: int = 15, description_size: int = 200, latency: float = 0.0, jitter: float = 0.0,
+                 error_404: float = 0.0, error_429: float = 0.0, error_5xx: float = 0.0, malformed: float = 0.0,
+                 seed: int = 0):
+        """
+        :param entries: number of entries in a feed (YouTube: up to 15)
+        :param description_size: length of the video descriptions
+        :param latency: delay of each response, seconds
+        :param jitter: random extra delay from 0 to jitter, seconds
+        :param error_404: share of feed and page requests answered with 404
+        :param error_429: share answered with 429 Too Many Requests
+        :param error_5xx: share answered with 500 or 503
+        :param malformed: share of feeds with malformed XML
+        :param seed: seed of the fault injection
+        """
+        self.entries = entries
+        self.description = ('lorem ipsum ' * (description_size // 12 + 1))[:description_size]
+        self.latency = latency
+        self.jitter = jitter
+        self.faults = [(error_404, 404), (error_429, 429), (error_5xx, 503)]
+        self.malformed = malformed
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.statuses = {}
+        self.latencies = []
+        self.server = None
+        self.base_url = None
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _fault(self):
+        roll = self._roll()
+        for share, status in self.faults:
+            if roll < share:
+                return status
+            roll -= share
+        return None
+
+    def feed(self, param: str, feed_id: str) -> bytes:
+        channel_id = feed_id if param == 'channel_id' else channel_id_for(feed_id)
+        digest = md5(feed_id.encode('utf-8')).hexdigest()
+        entries = '\n'.join(ENTRY.format(video_id=(digest[:8] + f'{n:03d}'), feed_id=feed_id, channel_id=channel_id,
+                                         day=n % 28 + 1, description=self.description, likes=n * 10, views=n * 1000)
+                            for n in range(self.entries))
+        xml = FEED.format(param=param, feed_id=feed_id, channel_id=channel_id, entries=entries)
+        if self.malformed and self._roll() < self.malformed:
+            xml = xml[:len(xml) // 2]
+        return xml.encode('utf-8')
+
+    def record(self, status: int, latency: float) -> None:
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self.latencies.append(latency)
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start the server in a background thread.
+
+        :return: base URL, e.g. http://127.0.0.1:8000 (YTFC_YOUTUBE_URL)
+        """
+        self.server = ThreadingHTTPServer((host, port), type('Handler', (FakeYouTubeHandler,), {'fake': self}))
+        self.server.daemon_threads = True
+        self.base_url = f'http://{host}:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            statuses = dict(self.statuses)
+        return {"requests": len(latencies), "statuses": statuses, "latencies": latencies}
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    fake = None  # FakeYouTube
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        start = time.monotonic()
+        fake = self.fake
+        if fake.latency or fake.jitter:
+            time.sleep(fake.latency + fake.jitter * fake._roll())
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        status = 200
+        if url.path.startswith('/vi/'):
+            self._send(status, IMAGE, 'image/gif')
+        elif url.path == '/feeds/videos.xml' and ('channel_id' in query or 'playlist_id' in query):
+            status = fake._fault() or 200
+            if status != 200:
+                self._send(status, b'error', 'text/plain')
+            else:
+                param = 'channel_id' if 'channel_id' in query else 'playlist_id'
+                self._send(status, fake.feed(param, query[param][0]), 'text/xml; charset=UTF-8')
+        elif url.path.startswith('/@'):
+            status = fake._fault() or 200
+            handle = unquote(url.path[1:])
+            body = b'error' if status != 200 else \
+                CHANNEL_PAGE.format(handle=handle, base_url=fake.base_url,
+                                    channel_id=channel_id_for(handle)).encode('utf-8')
+            self._send(status, body, 'text/html; charset=utf-8')
+        else:
+            status = 404
+            self._send(status, b'not found', 'text/plain')
+        fake.record(status, time.monotonic() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local stand-in for YouTube pages and feeds.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--entries', type=int, default=15)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-404', type=float, default=0.0)
+    parser.add_argument('--error-429', type=float, default=0.0)
+    parser.add_argument('--error-5xx', type=float, default=0.0)
+    parser.add_argument('--malformed', type=float, default=0.0)
+    args = parser.parse_args()
+    fake = FakeYouTube(entries=args.entries, latency=args.latency, jitter=args.jitter, error_404=args.error_404,
+                       error_429=args.error_429, error_5xx=args.error_5xx, malformed=args.malformed)
+    print(f'Serving on {fake.start(args.host, args.port)} (press Ctrl+C to stop).')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,135 @@
+"""
+End-to-end load test of the CLI against a local stand-in for YouTube (fake_youtube.py).
+
+For each configuration (number of IDs x workers), the real CLI is run as a subprocess:
+    python -m ytfc -r <generated IDs> -f ndjson -w <workers> <extra args>
+with YTFC_YOUTUBE_URL pointing to the stand-in server.
+
+Reported per configuration: wall time, throughput (IDs/s), completed records, records with errors,
+whether the run was stopped by an unexpected error, server-side request latency percentiles
+(including the injected latency) and peak RSS of the CLI process.
+
+Examples:
+    python loadtest/run_loadtest.py --ids 1000 10000 --workers 1 8 32
+    python loadtest/run_loadtest.py --ids 100000 --workers 32 --latency 0.05 --jitter 0.05 \\
+        --error-404 0.01 --malformed 0.005 --extra-args="--dedupe hashed"
+    python loadtest/run_loadtest.py --ids 10000 --workers 16 --proxies 4 --proxy-429 0.05
+
+Peak RSS is measured with os.wait4 (Linux, macOS).
+"""
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Dict
+
+from fake_proxy import FakeProxy
+from fake_youtube import FakeYouTube
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_ids(number: int) -> List[str]:
+    """Valid, unique IDs: channels, uploads playlists, @handles and regular playlists."""
+    ids = []
+    for i in range(number):
+        kind = i % 10
+        if kind < 6:
+            ids.append(f'UC{i:022d}')
+        elif kind < 8:
+            ids.append(f'UULF{i:022d}')
+        elif kind < 9:
+            ids.append(f'@user{i}')
+        else:
+            ids.append(f'PL{i:032d}')
+    return ids
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run_cli(base_url: str, ids_path: str, workers: int, extra_args: List[str]) -> Dict:
+    env = dict(os.environ, YTFC_YOUTUBE_URL=base_url, PYTHONPATH=PROJECT_DIR)
+    cmd = [sys.executable, '-m', 'ytfc', '-r', ids_path, '-f', 'ndjson', '-w', str(workers)] + extra_args
+    records = errors = 0
+    aborted = False
+    with tempfile.TemporaryFile() as stderr:
+        start = time.monotonic()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr, cwd=PROJECT_DIR, env=env)
+        for line in proc.stdout:
+            if not line.startswith(b'{'):
+                # python_exceptions prints the unexpected error to stdout when the run stops
+                aborted = aborted or line.startswith(b'Unfortunately, an unexpected error occurred')
+                continue
+            records += 1
+            if b'"error_message"' in line:
+                errors += 1
+        _, status, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = status
+        wall = time.monotonic() - start
+        stderr.seek(0)
+        aborted = aborted or b'Unfortunately, an unexpected error occurred' in stderr.read()
+    # ru_maxrss: kilobytes on Linux, bytes on macOS
+    peak_rss = rusage.ru_maxrss / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10)
+    return {"wall": wall, "records": records, "errors": errors, "aborted": aborted, "peak_rss_mb": peak_rss}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test of the CLI against a local stand-in for YouTube.')
+    parser.add_argument('--ids', type=int, nargs='+', default=[1000], help='Numbers of IDs (default 1000).')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8], help='Values of --workers (default 1 8).')
+    parser.add_argument('--entries', type=int, default=15, help='Entries per feed (default 15).')
+    parser.add_argument('--description-size', type=int, default=200, help='Length of descriptions (default 200).')
+    parser.add_argument('--latency', type=float, default=0.0, help='Response delay, seconds.')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra delay up to, seconds.')
+    parser.add_argument('--error-404', type=float, default=0.0, help='Share of 404 responses.')
+    parser.add_argument('--error-429', type=float, default=0.0, help='Share of 429 responses.')
+    parser.add_argument('--error-5xx', type=float, default=0.0, help='Share of 503 responses.')
+    parser.add_argument('--malformed', type=float, default=0.0, help='Share of feeds with malformed XML.')
+    parser.add_argument('--proxies', type=int, default=0, help='Number of local proxies (--proxy) to use.')
+    parser.add_argument('--proxy-429', type=float, default=0.0,
+                        help='Share of 429 responses of the proxies (the first proxy gets 10 times more).')
+    parser.add_argument('--extra-args', default='', help='Additional CLI options, e.g. "-v --dedupe".')
+    args = parser.parse_args()
+
+    header = f'{"ids":>7} {"workers":>7} {"wall s":>8} {"IDs/s":>8} {"records":>8} {"errors":>7} ' \
+             f'{"aborted":>7} {"requests":>8} {"p50 ms":>7} {"p95 ms":>7} {"p99 ms":>7} {"RSS MB":>7}'
+    print(header)
+    for number in args.ids:
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write('\n'.join(make_ids(number)))
+            ids_path = f.name
+        try:
+            for workers in args.workers:
+                fake = FakeYouTube(entries=args.entries, description_size=args.description_size,
+                                   latency=args.latency, jitter=args.jitter, error_404=args.error_404,
+                                   error_429=args.error_429, error_5xx=args.error_5xx, malformed=args.malformed)
+                base_url = fake.start()
+                proxies = [FakeProxy(error_429=min(1.0, args.proxy_429 * (10 if i == 0 else 1)), seed=i)
+                           for i in range(args.proxies)]
+                proxy_args = [arg for proxy in proxies for arg in ('--proxy', proxy.start())]
+                try:
+                    result = run_cli(base_url, ids_path, workers, proxy_args + shlex.split(args.extra_args))
+                finally:
+                    fake.stop()
+                    for proxy in proxies:
+                        proxy.stop()
+                stats = fake.stats()
+                latencies = stats["latencies"]
+                print(f'{number:>7} {workers:>7} {result["wall"]:>8.2f} {number / result["wall"]:>8.1f} '
+                      f'{result["records"]:>8} {result["errors"]:>7} {str(result["aborted"]):>7} '
+                      f'{stats["requests"]:>8} {percentile(latencies, 0.5) * 1000:>7.1f} '
+                      f'{percentile(latencies, 0.95) * 1000:>7.1f} {percentile(latencies, 0.99) * 1000:>7.1f} '
+                      f'{result["peak_rss_mb"]:>7.1f}', flush=True)
+        finally:
+            os.remove(ids_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'loadtest'))
+
+from fake_youtube import FakeYouTube  # noqa: E402
+
+
+@pytest.fixture
+def fake_youtube(monkeypatch):
+    """Local stand-in for YouTube (see loadtest/fake_youtube.py), used instead of YOUTUBE_URL."""
+    fake = FakeYouTube(entries=3)
+    url = fake.start()
+    monkeypatch.setattr('ytfc.utils.output_utils.YOUTUBE_URL', url)
+    monkeypatch.setattr('ytfc.utils.request_utils.YOUTUBE_URL', url)
+    yield fake
+    fake.stop()
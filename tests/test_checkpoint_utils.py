@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.checkpoint_utils import Checkpoint, load_checkpoint
+
+
+def test_incomplete_records_are_ignored(tmp_path):
+    path = str(tmp_path / 'run.ndjson')
+    with Checkpoint(path).open() as checkpoint:
+        checkpoint.write_feed('UC1', {"feed_info": {}, "entries": []})
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"id": "UC2", "entr')
+    # the next run starts its records on a new line
+    with Checkpoint(path, fsync_interval=0).open() as checkpoint:
+        checkpoint.write_feed('UC3', {"error_message": "Failed"})
+    assert load_checkpoint(path) == {'UC1': {"feed_info": {}, "entries": []}, 'UC3': {"error_message": "Failed"}}
+
+
+def test_resume_requests_only_the_remaining_ids(tmp_path, fake_youtube, monkeypatch, capsys):
+    path = tmp_path / 'run.ndjson'
+    output = tmp_path / 'output.json'
+    ids = ['UC0000000000000000000001', 'UC0000000000000000000002']
+    path.write_text(json.dumps({"id": ids[0], "feed_info": {"channel_title": "Recorded"}, "entries": []}) + '\n')
+
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', *ids, '-np', '-s', str(output), '--checkpoint', str(path)])
+    with pytest.raises(SystemExit):
+        main()
+    assert 'Use --resume to continue the run' in capsys.readouterr().err
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', *ids, '-np', '-s', str(output), '--checkpoint', str(path),
+                                     '--resume'])
+    with pytest.raises(SystemExit):
+        main()
+
+    assert sum(fake_youtube.stats()["statuses"].values()) == 1
+    feeds = json.loads(output.read_text())["feeds"]
+    assert list(feeds) == ids
+    assert feeds[ids[0]]["feed_info"]["channel_title"] == 'Recorded'
+    assert len(feeds[ids[1]]["entries"]) == 3
+    assert list(load_checkpoint(str(path))) == ids
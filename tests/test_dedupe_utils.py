@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.dedupe_utils import ExactSeenSet, HashedSeenSet, mark_duplicates, resolve_references
+
+
+def entry(video_id):
+    return {"video_title": f'Video {video_id}', "video_url": f'https://www.youtube.com/watch?v={video_id}',
+            "published": "2024-01-01T00:00:00+00:00"}
+
+
+def reference(video_id, target):
+    return {"video_url": f'https://www.youtube.com/watch?v={video_id}', "duplicate_of": target}
+
+
+@pytest.mark.parametrize('seen', [ExactSeenSet(), HashedSeenSet(100)])
+def test_seen_set(seen):
+    assert seen.add('aaaaaaaaaaa', 'UC1') is None
+    assert seen.add('bbbbbbbbbbb', 'PL2') is None
+    assert seen.add('aaaaaaaaaaa', 'PL2') == 'UC1'
+    assert len(seen) == 2
+    assert seen.stats()["duplicates"] == 1
+
+
+def test_hashed_seen_set_overflow():
+    seen = HashedSeenSet(1)
+    assert seen.add('aaaaaaaaaaa', 'UC1') is None
+    assert seen.add('bbbbbbbbbbb', 'UC1') is None
+    assert seen.add('bbbbbbbbbbb', 'UC1') is None
+    assert seen.stats()["overflow"] == 2
+
+
+def test_mark_duplicates():
+    seen = ExactSeenSet()
+    assert mark_duplicates(seen, 'UC1', [entry('aaaaaaaaaaa')]) == [entry('aaaaaaaaaaa')]
+    assert mark_duplicates(seen, 'PL2', [entry('aaaaaaaaaaa'), entry('bbbbbbbbbbb')]) == \
+        [reference('aaaaaaaaaaa', 'UC1'), entry('bbbbbbbbbbb')]
+
+
+def test_resolve_references():
+    feeds = {"UC1": {"feed_info": {}, "entries": [entry('aaaaaaaaaaa')]},
+             "PL2": {"feed_info": {}, "entries": [reference('aaaaaaaaaaa', 'UC1')]},
+             "PL3": {"feed_info": {}, "entries": [reference('aaaaaaaaaaa', 'PL2'), reference('ccccccccccc', 'UC9')]}}
+    assert resolve_references(feeds["PL2"]["entries"], feeds, lambda target, url: True) == \
+        [reference('aaaaaaaaaaa', 'UC1')]
+    # the chain of references is followed to the entry, references to unknown feeds are dropped
+    assert resolve_references(feeds["PL3"]["entries"], feeds, lambda target, url: False) == [entry('aaaaaaaaaaa')]
+
+
+def test_from_json_with_number_expands_references_to_truncated_entries(tmp_path, monkeypatch):
+    saved = {"created_utc": "2024-01-01T00:00:00+00:00", "ids": ["UC1", "PL2"], "feeds": {
+        "UC1": {"feed_info": {}, "entries": [entry('aaaaaaaaaaa'), entry('bbbbbbbbbbb')]},
+        "PL2": {"feed_info": {}, "entries": [reference('bbbbbbbbbbb', 'UC1'), reference('aaaaaaaaaaa', 'UC1')]}
+    }}
+    saved_path, output_path = tmp_path / 'deduped.json', tmp_path / 'output.json'
+    saved_path.write_text(json.dumps(saved))
+    monkeypatch.setattr('sys.argv', ['ytfc', '--from-json', str(saved_path), '-n', '1', '-np',
+                                     '-s', str(output_path)])
+    with pytest.raises(SystemExit):
+        main()
+    feeds = json.loads(output_path.read_text())["feeds"]
+    assert feeds["UC1"]["entries"] == [entry('aaaaaaaaaaa')]
+    # bbbbbbbbbbb is not in the output of UC1 (-n 1)
+    assert feeds["PL2"]["entries"] == [entry('bbbbbbbbbbb')]
+
+
+def test_from_json_keeps_references_to_entries_in_the_output(tmp_path, monkeypatch):
+    saved = {"created_utc": "2024-01-01T00:00:00+00:00", "ids": ["UC1", "PL2"], "feeds": {
+        "UC1": {"feed_info": {}, "entries": [entry('aaaaaaaaaaa'), entry('bbbbbbbbbbb')]},
+        "PL2": {"feed_info": {}, "entries": [reference('aaaaaaaaaaa', 'UC1')]}
+    }}
+    saved_path, output_path = tmp_path / 'deduped.json', tmp_path / 'output.json'
+    saved_path.write_text(json.dumps(saved))
+    monkeypatch.setattr('sys.argv', ['ytfc', '--from-json', str(saved_path), '-n', '1', '-np',
+                                     '-s', str(output_path)])
+    with pytest.raises(SystemExit):
+        main()
+    assert json.loads(output_path.read_text())["feeds"]["PL2"]["entries"] == [reference('aaaaaaaaaaa', 'UC1')]
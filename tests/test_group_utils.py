@@ -0,0 +1,49 @@
+import json
+
+from fake_youtube import channel_id_for
+from ytfc.utils.group_utils import (load_manifest, resolve_handles, union_ids, group_output, number_of_requests,
+                                    groups_report)
+
+
+def test_load_manifest(tmp_path):
+    (tmp_path / 'news.txt').write_text('@news\nUCBR8-60-B28hp2BmDPdntcQ\n')
+    (tmp_path / 'manifest.json').write_text(json.dumps({
+        "news": {"read": "news.txt", "save": ["news.json"]},
+        "music": {"ids": ["@Music", "UCBR8-60-B28hp2BmDPdntcQ"], "save": ["music.txt", "music.html"]}
+    }))
+    groups, error_message = load_manifest(str(tmp_path / 'manifest.json'))
+    assert error_message is None
+    assert groups["news"]["ids"] == ['@news', 'UCBR8-60-B28hp2BmDPdntcQ']
+    assert groups["music"]["ids"] == ['@music', 'UCBR8-60-B28hp2BmDPdntcQ']
+    assert set(groups["music"]["save"].values()) == {'txt', 'html'}
+
+
+def test_the_same_file_in_two_groups_is_rejected(tmp_path):
+    (tmp_path / 'manifest.json').write_text(json.dumps({
+        "a": {"ids": ["@a"], "save": ["out.json"]}, "b": {"ids": ["@b"], "save": ["out.json"]}
+    }))
+    groups, error_message = load_manifest(str(tmp_path / 'manifest.json'))
+    assert groups is None and error_message
+
+
+def test_union_is_keyed_by_resolved_feed(fake_youtube):
+    channel_id = channel_id_for('@user1')
+    groups = {"a": {"ids": ['@user1', '@user2'], "save": {}}, "b": {"ids": [channel_id, '@user2'], "save": {}}}
+    assert union_ids(groups) == ['@user1', '@user2', channel_id]
+    aliases = resolve_handles(union_ids(groups), workers=2)
+    assert aliases == {'@user1': channel_id, '@user2': channel_id_for('@user2')}
+    assert union_ids(groups, aliases) == [channel_id, channel_id_for('@user2')]
+    output = {"created_utc": "...", "feeds": {channel_id: {"entries": [1]}, channel_id_for('@user2'): {"entries": [2]}}}
+    assert group_output(output, groups["a"]["ids"], aliases) == \
+        {"created_utc": "...", "ids": ['@user1', '@user2'],
+         "feeds": {'@user1': {"entries": [1]}, '@user2': {"entries": [2]}}}
+    assert 'unique feeds: 2' in groups_report(groups, aliases)
+
+
+def test_handles_that_are_not_resolved_stay_in_the_run(fake_youtube):
+    fake_youtube.faults = [(1.0, 404)]
+    assert resolve_handles(['@user1', 'UCBR8-60-B28hp2BmDPdntcQ']) == {}
+
+
+def test_number_of_requests():
+    assert number_of_requests(['@user1', 'UCBR8-60-B28hp2BmDPdntcQ', 'PLxxxx']) == 4
@@ -0,0 +1,40 @@
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.output_utils import HTMLFormat
+
+
+def make_output(number_of_ids):
+    feeds = {f'UC{i:022d}': {"feed_info": {"feed_type": "CHANNEL FEED", "feed_title": str(i), "channel_title": str(i)},
+                             "entries": [{"video_title": "Video", "published": "2024-01-01T00:00:00+00:00",
+                                          "video_url": f'https://www.youtube.com/watch?v={i:011d}'}]}
+             for i in range(number_of_ids)}
+    return {"created_utc": "2024-01-01T00:00:00+00:00", "ids": list(feeds), "feeds": feeds}
+
+
+def test_page_filename():
+    assert HTMLFormat.page_filename('path/to/report.html', 2) == 'path/to/report-2.html'
+    assert [HTMLFormat.number_of_pages(n, 2) for n in (0, 1, 2, 3)] == [1, 1, 1, 2]
+
+
+def test_pages_link_to_each_other(tmp_path):
+    path = tmp_path / 'report.html'
+    HTMLFormat(page_size=2).save_to_file(str(path), make_output(5))
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['report-1.html', 'report-2.html', 'report-3.html',
+                                                          'report.html']
+    index = path.read_text()
+    assert 'href="report-3.html#yt-id4"' in index
+    page = (tmp_path / 'report-2.html').read_text()
+    assert 'href="report-1.html">previous' in page and 'href="report-3.html">next' in page
+    assert page.count('id="yt-id') == 2
+    # one frame per video is loaded when scrolled into view, the others on hover
+    assert 'loading="lazy"' in page and 'data-src=' in page
+
+
+def test_existing_pages_are_not_overwritten(tmp_path, monkeypatch, capsys):
+    (tmp_path / 'report-2.html').write_text('')
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', 'UC0000000000000000000001', 'UC0000000000000000000002',
+                                     '-np', '-s', str(tmp_path / 'report.html'), '-p', '1'])
+    with pytest.raises(SystemExit):
+        main()
+    assert 'report-2.html already exists' in capsys.readouterr().err
@@ -0,0 +1,50 @@
+import sqlite3
+
+import pytest
+
+from ytfc.utils.index_utils import SearchIndex, fts_query, format_result
+
+
+def make_feed(*entries, channel='Channel A'):
+    return {"feed_info": {"channel_title": channel},
+            "entries": [{"video_title": title, "video_url": f'https://www.youtube.com/watch?v={video_id}',
+                         "published": "2024-01-01T00:00:00+00:00", "description": description}
+                        for video_id, title, description in entries]}
+
+
+@pytest.fixture
+def index(tmp_path):
+    with SearchIndex(str(tmp_path / 'videos.db')).open() as index:
+        index.add_feed('UC1', make_feed(('aaaaaaaaaaa', 'Live stream replay', 'No description'),
+                                        ('bbbbbbbbbbb', 'Cooking', 'A live show about a stream of ideas')))
+        index.add_feed('UC2', make_feed(('ccccccccccc', 'Music', 'Live stream'), channel='Live Stream Channel'))
+        yield index
+
+
+def test_fts_query():
+    assert fts_query('live "stream') == '"live" """stream"'
+
+
+def test_titles_rank_before_channels_and_descriptions(index):
+    results = index.search('live stream')
+    assert [r["video_id"] for r in results] == ['aaaaaaaaaaa', 'ccccccccccc', 'bbbbbbbbbbb']
+    assert results[0]["rank"] < results[1]["rank"] < results[2]["rank"]
+    assert results[2]["snippet"].count('[') == 2
+    assert 'https://www.youtube.com/watch?v=aaaaaaaaaaa' in format_result(1, results[0])
+
+
+def test_limit_and_raw_queries(index):
+    assert len(index.search('live', limit=1)) == 1
+    assert [r["video_id"] for r in index.search('title:cook*', raw=True)] == ['bbbbbbbbbbb']
+    with pytest.raises(sqlite3.OperationalError):
+        index.search('title:(', raw=True)
+
+
+def test_videos_are_indexed_once(index):
+    index.add_feed('PL3', make_feed(('aaaaaaaaaaa', 'Live stream replay', 'No description')))
+    assert index.count() == 3
+    # a changed title is updated, a run without --verbose keeps the description
+    index.add_feed('UC1', {"feed_info": {"channel_title": "Channel A"},
+                           "entries": [{"video_title": "Cooking live", "published": "2024-01-01T00:00:00+00:00",
+                                        "video_url": 'https://www.youtube.com/watch?v=bbbbbbbbbbb'}]})
+    assert [r["video_id"] for r in index.search('cooking ideas')] == ['bbbbbbbbbbb']
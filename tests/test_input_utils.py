@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.input_utils import load_output, select_feed
+
+
+def run(monkeypatch, *argv):
+    monkeypatch.setattr('sys.argv', ['ytfc', *argv])
+    with pytest.raises(SystemExit):
+        main()
+
+
+def test_select_feed_removes_verbose_details():
+    feed = {"feed_info": {"channel_title": "A", "channel_url": "url"},
+            "entries": [{"video_title": str(i), "views": i} for i in range(3)]}
+    assert select_feed(feed, verbose=False, number=2) == {"feed_info": {"channel_title": "A"},
+                                                          "entries": [{"video_title": "0"}, {"video_title": "1"}]}
+    assert select_feed(feed, verbose=True, number=None) == feed
+
+
+def test_rerender_saved_results_without_requests(tmp_path, fake_youtube, monkeypatch):
+    ids = ['UC0000000000000000000001', 'PL0000000000000001']
+    saved = tmp_path / 'saved.json'
+    run(monkeypatch, '-i', *ids, '-v', '-np', '-s', str(saved))
+    requests = sum(fake_youtube.stats()["statuses"].values())
+
+    output = tmp_path / 'output.json'
+    run(monkeypatch, '--from-json', str(saved), '-i', ids[1], '-n', '1', '-np', '-s', str(output))
+    assert sum(fake_youtube.stats()["statuses"].values()) == requests
+    rendered = json.loads(output.read_text())
+    assert rendered["created_utc"] == json.loads(saved.read_text())["created_utc"]
+    assert list(rendered["feeds"]) == [ids[1]] and len(rendered["feeds"][ids[1]]["entries"]) == 1
+    assert "views" not in rendered["feeds"][ids[1]]["entries"][0]
+
+
+def test_parse_the_archive(tmp_path, fake_youtube, monkeypatch):
+    archive = tmp_path / 'archive'
+    archive.mkdir()
+    ids = ['UC0000000000000000000001', 'PL0000000000000001']
+    run(monkeypatch, '-i', *ids, '-np', '-s', str(tmp_path / 'saved.ndjson'), '--archive', str(archive))
+    assert sorted(p.name for p in archive.iterdir()) == sorted(f'{i}.xml' for i in ids)
+
+    requests = sum(fake_youtube.stats()["statuses"].values())
+    output = tmp_path / 'output.json'
+    run(monkeypatch, '--from-archive', str(archive), '-np', '-s', str(output))
+    assert sum(fake_youtube.stats()["statuses"].values()) == requests
+    assert json.loads(output.read_text())["feeds"] == load_output(str(tmp_path / 'saved.ndjson'))["feeds"]
@@ -0,0 +1,42 @@
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.metrics_utils import Counter, Histogram, REGISTRY, render, write_textfile
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('test_seconds', 'Test.', ['phase'], buckets=(0.1, 1))
+    REGISTRY.remove(histogram)
+    for value in (0.05, 0.1, 0.5, 2):
+        histogram.observe(value, 'fetch')
+    assert histogram.samples() == ['test_seconds_bucket{phase="fetch",le="0.1"} 2',
+                                   'test_seconds_bucket{phase="fetch",le="1"} 3',
+                                   'test_seconds_bucket{phase="fetch",le="+Inf"} 4',
+                                   'test_seconds_sum{phase="fetch"} 2.65',
+                                   'test_seconds_count{phase="fetch"} 4']
+
+
+def test_counter_total():
+    counter = Counter('test_total', 'Test.', ['code'])
+    REGISTRY.remove(counter)
+    counter.inc('200', amount=2)
+    counter.inc('404')
+    assert counter.total() == 3
+    assert counter.samples() == ['test_total{code="200"} 2', 'test_total{code="404"} 1']
+
+
+def test_textfile(tmp_path):
+    path = tmp_path / 'ytfc.prom'
+    write_textfile(str(path))
+    assert path.read_text() == render()
+    assert '# TYPE ytfc_phase_seconds histogram' in render()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_metrics_file_of_a_run(tmp_path, fake_youtube, monkeypatch):
+    path = tmp_path / 'ytfc.prom'
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', 'UC0000000000000000000001', '-np', '-s', str(tmp_path / 'out.json'),
+                                     '--metrics-file', str(path)])
+    with pytest.raises(SystemExit):
+        main()
+    assert 'ytfc_phase_seconds_count{phase="fetch"}' in path.read_text()
@@ -0,0 +1,110 @@
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.notify_utils import VideoTracker, Notifier
+
+
+def make_feed(*video_ids, error=False):
+    feed = {"feed_info": {"channel_title": "Channel"},
+            "entries": [{"video_title": f'Video {i}', "video_url": f'https://www.youtube.com/watch?v={i}',
+                         "published": "2024-01-01T00:00:00+00:00"} for i in video_ids]}
+    if error:
+        feed["error_message"] = "Failed to get data from: ..."
+    return feed
+
+
+def test_first_run_records_without_events(tmp_path):
+    tracker = VideoTracker(str(tmp_path / 'seen.json'))
+    assert tracker.new_videos('UC1', make_feed('bbbbbbbbbbb', 'aaaaaaaaaaa')) == []
+    # entries are newest first, events oldest first
+    events = tracker.new_videos('UC1', make_feed('ddddddddddd', 'ccccccccccc', 'bbbbbbbbbbb'))
+    assert [e["video_id"] for e in events] == ['ccccccccccc', 'ddddddddddd']
+    assert tracker.new_videos('UC1', make_feed('ddddddddddd')) == []
+    assert tracker.new_videos('UC1', make_feed(error=True)) == []
+
+
+def test_undelivered_videos_are_not_saved(tmp_path):
+    path = tmp_path / 'seen.json'
+    tracker = VideoTracker(str(path))
+    tracker.new_videos('UC1', make_feed('aaaaaaaaaaa'))
+    events = tracker.new_videos('UC1', make_feed('bbbbbbbbbbb', 'aaaaaaaaaaa'))
+    tracker.save(events)
+    assert json.loads(path.read_text()) == {"UC1": ['aaaaaaaaaaa']}
+    # the next run reports the video again
+    assert [e["video_id"] for e in VideoTracker(str(path)).new_videos('UC1', make_feed('bbbbbbbbbbb'))] == \
+        ['bbbbbbbbbbb']
+
+
+class Webhook(BaseHTTPRequestHandler):
+    statuses = []
+    received = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status, headers = self.statuses.pop(0) if self.statuses else (200, {})
+        if status == 200:
+            self.received.append(body)
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook():
+    Webhook.statuses, Webhook.received = [], []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Webhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}/'
+    server.shutdown()
+
+
+def event(video_id):
+    return {"feed": "UC1", "video_id": video_id}
+
+
+def test_batches_are_retried_and_delivered(webhook, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('ytfc.utils.notify_utils.time.sleep', sleeps.append)
+    Webhook.statuses = [(503, {}), (429, {"Retry-After": "3600"})]
+    notifier = Notifier([webhook], batch_interval=0.1, backoff=1.0)
+    notifier.publish([event('aaaaaaaaaaa'), event('aaaaaaaaaaa'), event('bbbbbbbbbbb')])
+    notifier.close(timeout=10)
+    # repeated events are coalesced, Retry-After is capped
+    assert Webhook.received == [{"events": [event('aaaaaaaaaaa'), event('bbbbbbbbbbb')]}]
+    assert sleeps == [1.0, Notifier.max_delay]
+    assert notifier.delivered == 2
+    assert notifier.undelivered() == []
+
+
+def test_failed_batches_are_undelivered(webhook, monkeypatch):
+    monkeypatch.setattr('ytfc.utils.notify_utils.time.sleep', lambda seconds: None)
+    Webhook.statuses = [(500, {})] * 3
+    notifier = Notifier([webhook], batch_interval=0.1, retries=3)
+    notifier.publish([event('aaaaaaaaaaa')])
+    notifier.close(timeout=10)
+    assert notifier.failed == 1
+    assert notifier.undelivered() == [event('aaaaaaaaaaa')]
+
+
+def test_subscribers_get_numbered_events():
+    notifier = Notifier([])
+    subscriber = notifier.subscribe()
+    notifier.publish([event('aaaaaaaaaaa')])
+    assert subscriber.get_nowait() == (1, event('aaaaaaaaaaa'))
+
+
+def test_webhook_can_not_be_used_with_number(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', 'UCBR8-60-B28hp2BmDPdntcQ', '-n', '2', '-np',
+                                     '--webhook', 'http://127.0.0.1:1/', '--notify-state', str(tmp_path / 's.json')])
+    with pytest.raises(SystemExit) as e:
+        main()
+    assert e.value.code == 1
+    assert '--webhook can not be used with --number' in capsys.readouterr().err
@@ -0,0 +1,60 @@
+import gzip
+import json
+
+import pytest
+
+from ytfc.__main__ import main
+from ytfc.utils.input_utils import load_output
+from ytfc.utils.output_utils import Output, NDJSONFormat
+
+
+def test_output_keeps_the_order_of_the_ids(fake_youtube):
+    ids = ['@user1', 'UC0000000000000000000001', 'PL0000000000000001']
+    o = Output(ids, workers=3)
+    o.generate_output(verbose=True, number=2, no_print=True, save=True)
+    assert list(o.output["feeds"]) == ids
+    assert all(len(feed["entries"]) == 2 and "views" in feed["entries"][0] for feed in o.output["feeds"].values())
+
+
+def test_failed_feeds_have_an_error_message(fake_youtube):
+    fake_youtube.faults = [(1.0, 404)]
+    o = Output(['UC0000000000000000000001'])
+    o.generate_output(verbose=False, number=None, no_print=True, save=True)
+    assert o.output["feeds"]['UC0000000000000000000001']["error_message"].startswith('Failed to get data from')
+
+
+def test_several_files_from_one_fetch(tmp_path, fake_youtube, monkeypatch):
+    paths = [tmp_path / name for name in ('out.json', 'out.html', 'out.txt', 'out.ndjson')]
+    argv = ['ytfc', '-i', '@user1', 'UC0000000000000000000001', '-np']
+    for path in paths:
+        argv.extend(['-s', str(path)])
+    monkeypatch.setattr('sys.argv', argv)
+    with pytest.raises(SystemExit):
+        main()
+    # a channel page and two feeds
+    assert sum(fake_youtube.stats()["statuses"].values()) == 3
+    assert list(json.loads(paths[0].read_text())["feeds"]) == ['@user1', 'UC0000000000000000000001']
+    assert 'UC0000000000000000000001' in paths[1].read_text() and 'video url' in paths[2].read_text()
+    assert len(paths[3].read_text().splitlines()) == 2
+
+
+def test_ndjson_records_per_entry(tmp_path):
+    path = str(tmp_path / 'out.ndjson.gz')
+    feeds = {"UC1": {"feed_info": {"channel_title": "A"}, "entries": [{"video_title": "1"}, {"video_title": "2"}]},
+             "UC2": {"feed_info": {}, "entries": [], "error_message": "Failed"}}
+    NDJSONFormat(per_entry=True).save_to_file(path, {"created_utc": "", "ids": list(feeds), "feeds": feeds})
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert [r["entry"] for r in records] == [{"video_title": "1"}, {"video_title": "2"}, None]
+    assert records[2] == {"id": "UC2", "feed_info": {}, "entry": None, "error_message": "Failed"}
+    # the records are collected back into feeds by --from-json
+    assert load_output(path)["feeds"] == feeds
+
+
+def test_ndjson_to_stdout(fake_youtube, monkeypatch, capsysbinary):
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', 'UC0000000000000000000001', 'PL0000000000000001', '-f', 'ndjson'])
+    with pytest.raises(SystemExit):
+        main()
+    out, err = capsysbinary.readouterr()
+    assert [json.loads(line)["id"] for line in out.splitlines()] == ['UC0000000000000000000001', 'PL0000000000000001']
+    assert b'ID(s)' in err
@@ -0,0 +1,98 @@
+import json
+import socket
+import time
+
+import pytest
+
+from fake_proxy import FakeProxy
+from ytfc.__main__ import main
+from ytfc.utils.request_utils import make_request, RequestBudget, ProxyPool, DeadlineExceeded
+
+
+def closed_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def feed_url(fake_youtube, channel_id='UCBR8-60-B28hp2BmDPdntcQ'):
+    return f'{fake_youtube.base_url}/feeds/videos.xml?channel_id={channel_id}'
+
+
+def test_make_request(fake_youtube):
+    content, code, msg = make_request(feed_url(fake_youtube), 'content')
+    assert code == 200 and content.startswith(b'<?xml') and msg is None
+
+
+def test_not_found_is_skipped(fake_youtube):
+    fake_youtube.faults = [(1.0, 404)]
+    content, code, msg = make_request(feed_url(fake_youtube), 'content')
+    assert content is None and code == 404 and 'not found' in msg
+
+
+def test_deadline_is_raised(fake_youtube):
+    budget = RequestBudget(deadline=0.01)
+    time.sleep(0.02)
+    with pytest.raises(DeadlineExceeded):
+        make_request(feed_url(fake_youtube), 'content', budget)
+    budget.close()
+
+
+def test_proxy_out_of_rotation_after_failures():
+    pool = ProxyPool(['http://10.0.0.1:3128', 'http://10.0.0.2:3128'], concurrency=2, failures=2, cooldown=60)
+    first, second = pool.endpoints
+    for _ in range(2):
+        endpoint = pool.acquire(exclude=[second])
+        assert endpoint is first
+        pool.release(endpoint, 'throttled', 0.1)
+    assert first.ejections == 1 and first.score == 0.0
+    # the other proxy is used while the first one is out of rotation
+    assert pool.acquire(timeout=0) is second
+    # 'error' is not a failure of the proxy
+    pool.release(second, 'error', 0.1)
+    assert second.consecutive_failures == 0
+
+
+def test_throttled_proxies_skip_the_id(fake_youtube):
+    proxies = [FakeProxy(error_429=1.0) for _ in range(2)]
+    pool = ProxyPool([p.start() for p in proxies], cooldown=0.05)
+    budget = RequestBudget(proxies=pool)
+    content, code, msg = make_request(feed_url(fake_youtube), 'content', budget)
+    assert content is None and code == 429 and 'All proxies' in msg
+    budget.close()
+    for p in proxies:
+        p.stop()
+
+
+def test_throttled_request_is_repeated_through_another_proxy(fake_youtube):
+    proxies = [FakeProxy(error_429=1.0), FakeProxy()]
+    pool = ProxyPool([p.start() for p in proxies], cooldown=0.05)
+    budget = RequestBudget(proxies=pool)
+    for _ in range(3):
+        content, code, msg = make_request(feed_url(fake_youtube), 'content', budget)
+        assert code == 200
+    budget.close()
+    for p in proxies:
+        p.stop()
+
+
+def test_unreachable_proxies_skip_the_id(fake_youtube):
+    pool = ProxyPool([f'http://127.0.0.1:{closed_port()}', f'http://127.0.0.1:{closed_port()}'], cooldown=0.05)
+    budget = RequestBudget(proxies=pool, connect=1, read=1)
+    content, code, msg = make_request(feed_url(fake_youtube), 'content', budget)
+    assert content is None and code is None and 'All proxies failed to connect' in msg
+    budget.close()
+
+
+def test_run_stops_at_the_deadline(tmp_path, fake_youtube, monkeypatch, capsys):
+    fake_youtube.latency = 2
+    output = tmp_path / 'output.json'
+    monkeypatch.setattr('sys.argv', ['ytfc', '-i', 'UC0000000000000000000001', 'UC0000000000000000000002',
+                                     '-np', '-s', str(output), '--deadline', '0.3'])
+    start = time.monotonic()
+    with pytest.raises(SystemExit):
+        main()
+    assert time.monotonic() - start < 1.5
+    assert 'Deadline exceeded: no data for 2 of 2 ID(s).' in capsys.readouterr().out
+    feeds = json.loads(output.read_text())["feeds"]
+    assert all(feed["error_message"].startswith('Deadline exceeded') for feed in feeds.values())
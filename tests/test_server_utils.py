@@ -0,0 +1,61 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ytfc.utils.server_utils import TTLCache, FeedService, FeedRequestHandler
+
+
+def test_ttl_cache_expires_and_evicts(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('ytfc.utils.server_utils.time.monotonic', lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    # 'b' is the least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None and len(cache) == 2
+    now[0] = 11
+    assert cache.get('a') is None and cache.get('c') is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+@pytest.fixture
+def server(fake_youtube):
+    service = FeedService(workers=2)
+    handler = type('Handler', (FeedRequestHandler,), {'service': service})
+    with ThreadingHTTPServer(('127.0.0.1', 0), handler) as httpd:
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{httpd.server_address[1]}'
+        httpd.shutdown()
+    service.budget.close()
+
+
+def test_feeds_are_served_from_the_cache(server, fake_youtube):
+    url = f'{server}/feeds?ids=UC0000000000000000000001,PL0000000000000001&number=2'
+    first = requests.get(url).json()
+    second = requests.get(url + '&verbose=1').json()
+    assert sum(fake_youtube.stats()["statuses"].values()) == 2
+    assert [len(feed["entries"]) for feed in first["feeds"].values()] == [2, 2]
+    assert "views" not in first["feeds"]['PL0000000000000001']["entries"][0]
+    assert "views" in second["feeds"]['PL0000000000000001']["entries"][0]
+
+
+def test_failed_feeds_are_not_cached(server, fake_youtube):
+    fake_youtube.faults = [(1.0, 503)]
+    response = requests.get(f'{server}/feeds/UC0000000000000000000001')
+    assert response.status_code == 200
+    assert response.json()["feeds"]['UC0000000000000000000001']["error_message"]
+    fake_youtube.faults = []
+    feed = requests.get(f'{server}/feeds/UC0000000000000000000001').json()["feeds"]['UC0000000000000000000001']
+    assert len(feed["entries"]) == 3
+
+
+def test_invalid_requests(server):
+    assert requests.get(f'{server}/feeds?ids=nope').status_code == 400
+    assert requests.get(f'{server}/feeds/UC0000000000000000000001?number=16').status_code == 400
+    assert requests.get(f'{server}/other').status_code == 404
+    assert 'ytfc_cache_requests_total' in requests.get(f'{server}/metrics').text
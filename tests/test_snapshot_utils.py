@@ -0,0 +1,93 @@
+import pytest
+
+from ytfc.__main__ import main, stats
+from ytfc.utils.snapshot_utils import SnapshotStore, load_columns, compute_stats, to_timestamp
+
+
+def make_feed(views, channel='https://www.youtube.com/channel/UCaaaaaaaaaaaaaaaaaaaaaa'):
+    return {
+        "feed_info": {"feed_type": "CHANNEL FEED", "channel_title": "Channel A", "channel_url": channel},
+        "entries": [{"video_title": f'Video {n}', "video_url": f'https://www.youtube.com/watch?v=video{n:06d}',
+                     "published": f'2024-01-0{n + 1}T00:00:00+00:00', "views": str(v), "likes": str(v // 10),
+                     "description": "No description"}
+                    for n, v in enumerate(views)]
+    }
+
+
+def test_to_timestamp():
+    assert to_timestamp('1970-01-02T00:00:00+00:00') == 86400
+    assert to_timestamp('No date') == -1
+
+
+def test_load_columns_of_empty_directory(tmp_path):
+    columns = load_columns(str(tmp_path))
+    assert len(columns["rows.time"]) == 0
+    assert columns["videos.id"] == []
+    assert compute_stats(columns)["rows"] == 0
+
+
+def test_stats_without_snapshots_exits_with_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as e:
+        stats(['--snapshots', str(tmp_path)])
+    assert e.value.code == 1
+    assert f'There are no snapshots in {tmp_path}' in capsys.readouterr().err
+
+
+def test_snapshots_are_appended_and_aggregated(tmp_path):
+    with SnapshotStore(str(tmp_path)).open() as store:
+        store.add_feed('UCaaaaaaaaaaaaaaaaaaaaaa', make_feed([100, 10]), timestamp=0)
+    with SnapshotStore(str(tmp_path)).open() as store:
+        store.add_feed('UCaaaaaaaaaaaaaaaaaaaaaa', make_feed([300, 10]), timestamp=86400)
+    assert store.rows == 4
+    columns = load_columns(str(tmp_path))
+    assert list(columns["videos.id"]) == ['video000000', 'video000001']
+    result = compute_stats(columns, top=1)
+    assert result["rows"] == 4
+    assert result["videos"] == 2
+    assert result["top_videos"][0]["video_id"] == 'video000000'
+    assert result["top_videos"][0]["views_gained"] == 200
+    assert result["top_videos"][0]["views_per_day"] == 200.0
+    assert result["top_channels"][0]["views_gained"] == 200
+
+
+def test_feeds_with_errors_are_skipped(tmp_path):
+    with SnapshotStore(str(tmp_path)).open() as store:
+        store.add_feed('UCaaaaaaaaaaaaaaaaaaaaaa', {"feed_info": {}, "entries": [], "error_message": "..."})
+    assert len(load_columns(str(tmp_path))["rows.time"]) == 0
+
+
+def test_committed_batches_of_a_killed_run_are_kept(tmp_path):
+    store = SnapshotStore(str(tmp_path), batch_size=1).open()
+    store.add_feed('UCaaaaaaaaaaaaaaaaaaaaaa', make_feed([100]), timestamp=0)
+    # not committed: the run is killed before the next batch or close
+    store._buffers['rows.video'].append(0)
+    store._buffers['rows.time'].append(1)
+    columns = load_columns(str(tmp_path))
+    assert list(columns["rows.time"]) == [0]
+    with SnapshotStore(str(tmp_path)).open() as reopened:
+        assert reopened.rows == 1
+
+
+def test_snapshots_are_not_recorded_from_saved_results(tmp_path, monkeypatch, capsys):
+    saved = tmp_path / 'output.json'
+    saved.write_text('{"created_utc": "2024-01-01T00:00:00+00:00", "ids": [], "feeds": {}}')
+    monkeypatch.setattr('sys.argv', ['ytfc', '--from-json', str(saved), '-v', '-np',
+                                     '--snapshots', str(tmp_path / 'snapshots')])
+    with pytest.raises(SystemExit) as e:
+        main()
+    assert e.value.code == 1
+    assert '--snapshots can only be used when requesting feeds' in capsys.readouterr().err
+
+
+def test_videos_of_a_playlist_belong_to_their_uploader(tmp_path):
+    playlist = make_feed([100])
+    playlist["feed_info"] = {"feed_type": "PLAYLIST FEED", "playlist_created_by": "Creator",
+                             "playlist_creator_url": 'https://www.youtube.com/channel/UCcreatorcreatorcreator0'}
+    playlist["entries"][0].update({"uploaded_by": "Channel A",
+                                   "uploader_url": 'https://www.youtube.com/channel/UCaaaaaaaaaaaaaaaaaaaaaa'})
+    with SnapshotStore(str(tmp_path)).open() as store:
+        store.add_feed('PLxxxx', playlist, timestamp=0)
+        store.add_feed('UCaaaaaaaaaaaaaaaaaaaaaa', make_feed([200]), timestamp=86400)
+    columns = load_columns(str(tmp_path))
+    assert columns["channels"] == [['https://www.youtube.com/channel/UCaaaaaaaaaaaaaaaaaaaaaa', 'Channel A']]
+    assert list(columns["videos.channel"]) == [0]
@@ -0,0 +1,40 @@
+import os
+
+from ytfc.utils.thumbnail_utils import ThumbnailCache
+
+
+def thumbnail_urls(fake_youtube, *video_ids):
+    return [f'{fake_youtube.base_url}/vi/{video_id}/hqdefault.jpg' for video_id in video_ids]
+
+
+def test_identical_files_are_stored_once(tmp_path, fake_youtube):
+    cache = ThumbnailCache(str(tmp_path), 2 ** 20, workers=2)
+    urls = thumbnail_urls(fake_youtube, 'aaaaaaaaaaa', 'bbbbbbbbbbb')
+    paths = cache.fetch_all(urls)
+    assert cache.downloaded == 2
+    # the placeholder image is the same for both videos
+    assert paths[urls[0]] == paths[urls[1]] and os.path.isfile(paths[urls[0]])
+
+
+def test_cache_is_shared_across_runs(tmp_path, fake_youtube):
+    urls = thumbnail_urls(fake_youtube, 'aaaaaaaaaaa')
+    ThumbnailCache(str(tmp_path), 2 ** 20).fetch_all(urls)
+    cache = ThumbnailCache(str(tmp_path), 2 ** 20)
+    cache.fetch_all(urls)
+    assert (cache.hits, cache.downloaded) == (1, 0)
+
+
+def test_missing_files_are_not_available(tmp_path, fake_youtube):
+    cache = ThumbnailCache(str(tmp_path), 2 ** 20)
+    url = f'{fake_youtube.base_url}/missing.jpg'
+    assert cache.fetch_all([url]) == {url: None}
+    assert cache.failed == 1
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), 10)
+    old = cache._store('https://example.com/old.jpg', b'x' * 8)
+    os.utime(old, (0, 0))
+    cache._store('https://example.com/new.jpg', b'y' * 8)
+    assert cache.evict() == 1
+    assert list(cache.index) == ['https://example.com/new.jpg']
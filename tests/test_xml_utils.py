@@ -0,0 +1,51 @@
+from ytfc.utils.xml_utils import XMLHandler, get_video_id
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/"
+      xmlns="http://www.w3.org/2005/Atom">
+ <link rel="self" href="http://www.youtube.com/feeds/videos.xml?%(param)s"/>
+ <title>Feed</title>
+ <author><name>Creator</name><uri>https://www.youtube.com/channel/UCcreatorcreatorcreator0</uri></author>
+ <published>2015-01-01T00:00:00+00:00</published>
+ <entry>
+  <yt:videoId>aaaaaaaaaaa</yt:videoId>
+  <yt:channelId>UCuploaderuploaderupload</yt:channelId>
+  <title>Video</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=aaaaaaaaaaa"/>
+  <author><name>Uploader</name><uri>https://www.youtube.com/channel/UCuploaderuploaderupload</uri></author>
+  <published>2024-01-01T00:00:00+00:00</published>
+  <media:group>
+   <media:description>Line 1
+Line 2</media:description>
+   <media:community>
+    <media:starRating count="5"/>
+    <media:statistics views="50"/>
+   </media:community>
+  </media:group>
+ </entry>
+</feed>"""
+
+
+def parse(param):
+    handler = XMLHandler()
+    root = handler.get_xml_feed(FEED % {b"param": param.encode()})
+    return handler.get_feed_info(root, True), handler.get_feed_videos(root, True, None)
+
+
+def test_get_video_id():
+    assert get_video_id('https://www.youtube.com/watch?v=aaaaaaaaaaa') == 'aaaaaaaaaaa'
+
+
+def test_channel_feed():
+    feed_info, entries = parse('channel_id=UCcreatorcreatorcreator0')
+    assert feed_info["feed_type"] == 'CHANNEL FEED'
+    assert entries == [{"video_title": "Video", "video_url": "https://www.youtube.com/watch?v=aaaaaaaaaaa",
+                        "published": "2024-01-01T00:00:00+00:00", "views": "50", "likes": "5",
+                        "description": "Line 1 Line 2"}]
+
+
+def test_entries_of_a_playlist_have_their_uploader():
+    feed_info, entries = parse('playlist_id=PLxxxx')
+    assert feed_info["playlist_created_by"] == 'Creator'
+    assert entries[0]["uploaded_by"] == 'Uploader'
+    assert entries[0]["uploader_url"] == 'https://www.youtube.com/channel/UCuploaderuploaderupload'
@@ -0,0 +1,91 @@
+import os
+import time
+from json import dumps, loads
+from typing import Dict
+
+from ytfc.utils.settings import CHECKPOINT_FSYNC_INTERVAL
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict]:
+    """Load the feeds of the IDs completed before the run was stopped.
+
+    Records that were not written completely (the run was killed while writing) are ignored.
+
+    :param path: "path/to/checkpoint.ndjson", --checkpoint value
+    :return: feed dicts by id, see Output._create_base_dict
+    """
+    feeds = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except ValueError:
+                continue
+            feeds[record.pop("id")] = record
+    return feeds
+
+
+class Checkpoint:
+    """Append-only record of the completed IDs of a run (--checkpoint, --resume).
+
+    One compact JSON object per line, the same as an NDJSON record per feed:
+        {"id": "...", "feed_info": {...}, "entries": [...], "error_message" or "info_message": "..."}
+
+    Each record is flushed to the operating system as soon as the feed is processed,
+    the file is synced to disk every CHECKPOINT_FSYNC_INTERVAL seconds and when it is closed.
+    """
+    def __init__(self, path: str, fsync_interval: float = CHECKPOINT_FSYNC_INTERVAL):
+        """
+        :param path: "path/to/checkpoint.ndjson", new records are appended
+        :param fsync_interval: seconds between syncs to disk
+        """
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._synced = time.monotonic()
+
+    def open(self) -> 'Checkpoint':
+        """Open the file for appending.
+
+        :return: self, can be used as a context manager
+        """
+        self._file = open(self.path, 'ab')
+        if self._file.tell():
+            # a run that was killed while writing leaves an incomplete last record
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self._file.write(b'\n')
+        return self
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._sync()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced = time.monotonic()
+
+    def write_feed(self, yt_id: str, feed: Dict) -> None:
+        """Record a completed id, used as Output.generate_output(on_feed=...).
+
+        :param yt_id: playlist id or channel id or @handle
+        :param feed: feed dict, see Output._create_base_dict
+        :return: None
+        """
+        self._file.write((dumps({"id": yt_id, **feed}, separators=(',', ':')) + '\n').encode('utf-8'))
+        self._file.flush()
+        if time.monotonic() - self._synced >= self.fsync_interval:
+            self._sync()
@@ -1,4 +1,5 @@
-from typing import Tuple, Union, List
+import os.path
+from typing import Tuple, Union, List, Dict
 
 from ytfc.utils.regex_patterns import (USERNAME_PATTERN, CHANNEL_PATTERN, PL_PATTERN,
                                        RD_PATTERN, OL_PATTERN, RDCLAK_PATTERN)
@@ -34,10 +35,13 @@ def check_duplicates(ids: List[str]) -> List[str]:
     :return: a list of IDs that do not contain duplicates
     """
     yt_ids = []
+    # set lookups, the list keeps the original order
+    seen = set()
     for i in ids:
         if i.startswith('@'):
             i = i.lower()
-        if i not in yt_ids:
+        if i not in seen:
+            seen.add(i)
             yt_ids.append(i)
         else:
             continue
@@ -105,3 +109,34 @@ def check_ids(ids: List[str], path: str) -> Union[Tuple[List[str], None], Tuple[
         return invalid_ids, None
     else:
         return None, check_duplicates(yt_ids)
+
+
+def check_save_files(paths: List[str]) -> Union[Tuple[Dict[str, str], None], Tuple[None, str]]:
+    """Checks the file paths to save the results.
+
+    Each file must not exist, its directory must exist,
+    the extension must be txt, html, json, ndjson or ndjson.gz.
+
+    :param paths: args.save, a list of file paths
+    :return: file paths with their formats (txt, html, json or ndjson) and None
+             or
+             None and an error message
+    """
+    save_files = {}
+    for save_path in paths:
+        if save_path in save_files:
+            return None, f'The file {save_path} is given more than once.\n'
+        if os.path.exists(save_path):
+            return None, f'The file {save_path} already exists. Choose a different file name.\n'
+        dir_path = os.path.dirname(save_path)
+        if dir_path and not os.path.exists(dir_path):
+            return None, f'The directory path {dir_path} does not exist. Check that the path is entered correctly.\n'
+        name, extension = os.path.splitext(save_path)
+        if extension == '.gz':
+            # only ndjson can be compressed
+            extension = '.ndjson' if os.path.splitext(name)[1] == '.ndjson' else extension
+        extension = extension[1:]
+        if extension not in ['txt', 'html', 'json', 'ndjson']:
+            return None, f'Saving to {save_path}. The file extension must be txt, html, json, ndjson or ndjson.gz.\n'
+        save_files[save_path] = extension
+    return save_files, None
@@ -1,7 +1,22 @@
+import sys
 from functools import wraps
 
 from lxml import etree
 
+from ytfc.utils.metrics_utils import PARSE_FAILURES
+
+
+# the messages of python_exceptions are printed to stdout, unless it is reserved for the output
+_messages = {"stderr": False}
+
+
+def messages_to_stderr() -> None:
+    """Print the messages of python_exceptions to stderr, stdout is reserved for the output (-f ndjson).
+
+    The messages are printed after the output is closed, so redirect_stdout does not apply to them.
+    """
+    _messages["stderr"] = True
+
 
 def python_exceptions(func):
     """Interception of the Python exceptions.
@@ -21,13 +36,17 @@ def python_exceptions(func):
         try:
             return func(*args, **kwargs)
         except KeyboardInterrupt:
-            print('The execution of the program was interrupted.')
+            print('The execution of the program was interrupted.', file=_stream())
         except Exception as e:
-            print('Unfortunately, an unexpected error occurred while retrieving the data.')
-            print(f'{e.__class__.__name__}: {e}')
+            print('Unfortunately, an unexpected error occurred while retrieving the data.', file=_stream())
+            print(f'{e.__class__.__name__}: {e}', file=_stream())
     return wrapper
 
 
+def _stream():
+    return sys.stderr if _messages["stderr"] else sys.stdout
+
+
 def lxml_exceptions(func):
     """Interception of the lxml exceptions.
     Used as decorator for get_channel_xml_link() and get_xml_feed().
@@ -43,6 +62,7 @@ def lxml_exceptions(func):
             # XML - get_xml_feed(r_content)
             # HTML - get_channel_xml_link(r_text)
             response = 'XML' if func.__name__ == 'get_xml_feed' else 'HTML'
+            PARSE_FAILURES.inc(response)
             print(f'Unable to parse {response} response.')
             print(f'{e.__class__.__name__}: {e}\n')
     return wrapper
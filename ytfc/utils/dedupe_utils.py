@@ -0,0 +1,175 @@
+from array import array
+from hashlib import blake2b
+from typing import Union, List, Dict, Callable
+
+from ytfc.utils.xml_utils import get_video_id
+
+
+class ExactSeenSet:
+    """Video IDs seen during the run and the ID of the feed where they were first seen (dict)."""
+    backend = 'exact'
+
+    def __init__(self):
+        self._seen = {}
+        self.duplicates = 0
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, video_id: str, yt_id: str) -> Union[str, None]:
+        """Record the video.
+
+        :param video_id: video ID of the feed entry
+        :param yt_id: playlist id or channel id or @handle of the feed
+        :return: ID of the feed where the video was first seen or None (new video)
+        """
+        if video_id not in self._seen:
+            self._seen[video_id] = yt_id
+            return None
+        self.duplicates += 1
+        return self._seen[video_id]
+
+    def stats(self) -> Dict:
+        return {"backend": self.backend, "videos": len(self), "duplicates": self.duplicates,
+                "memory_bytes": None, "false_positive_rate": 0.0}
+
+
+class HashedSeenSet:
+    """Memory-bounded seen-set for very large runs.
+
+    Open addressing table of 64-bit fingerprints of video IDs (linear probing).
+    The table is allocated once: 2 * capacity (rounded up to a power of two) slots,
+    12 bytes per slot (fingerprint + index of the first feed).
+    When capacity videos are recorded, new videos are no longer recorded (overflow)
+    and their later occurrences are not marked as duplicates.
+
+    A new video is reported as a duplicate only if its fingerprint matches
+    the fingerprint of another recorded video, see false_positive_rate.
+    """
+    backend = 'hashed'
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: maximum number of unique videos to record
+        """
+        size = 2
+        while size < capacity * 2:
+            size <<= 1
+        self.capacity = capacity
+        self._mask = size - 1
+        self._keys = array('Q', bytes(8 * size))  # 0 - empty slot
+        self._values = array('I', bytes(4 * size))
+        self._feeds = []  # index of the first feed -> yt_id
+        self._feed_index = {}
+        self._count = 0
+        self.duplicates = 0
+        self.overflow = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _fingerprint(video_id: str) -> int:
+        key = int.from_bytes(blake2b(video_id.encode('utf-8'), digest_size=8).digest(), 'little')
+        return key or 1
+
+    def add(self, video_id: str, yt_id: str) -> Union[str, None]:
+        """Record the video.
+
+        :param video_id: video ID of the feed entry
+        :param yt_id: playlist id or channel id or @handle of the feed
+        :return: ID of the feed where the video was first seen or None (new video)
+        """
+        key = self._fingerprint(video_id)
+        slot = key & self._mask
+        while self._keys[slot]:
+            if self._keys[slot] == key:
+                self.duplicates += 1
+                return self._feeds[self._values[slot]]
+            slot = (slot + 1) & self._mask
+        if self._count >= self.capacity:
+            self.overflow += 1
+            return None
+        if yt_id not in self._feed_index:
+            self._feed_index[yt_id] = len(self._feeds)
+            self._feeds.append(yt_id)
+        self._keys[slot] = key
+        self._values[slot] = self._feed_index[yt_id]
+        self._count += 1
+        return None
+
+    def false_positive_rate(self) -> float:
+        """Probability that a new video matches the fingerprint of a recorded video."""
+        return self._count / 2 ** 64
+
+    def stats(self) -> Dict:
+        return {"backend": self.backend, "videos": len(self), "duplicates": self.duplicates,
+                "memory_bytes": self._keys.buffer_info()[1] * self._keys.itemsize +
+                self._values.buffer_info()[1] * self._values.itemsize,
+                "false_positive_rate": self.false_positive_rate(), "overflow": self.overflow}
+
+
+def mark_duplicates(seen: Union[ExactSeenSet, HashedSeenSet], yt_id: str, entries: List[dict]) -> List[dict]:
+    """Replace entries that were already seen in the run with references to the first feed.
+
+    Reference: {"video_url": "...", "duplicate_of": "<playlist id or channel id or @handle>"}
+
+    :param seen: seen-set of the run
+    :param yt_id: playlist id or channel id or @handle of the feed
+    :param entries: list of feed entries, see XMLHandler.get_feed_videos
+    :return: list of feed entries and references
+    """
+    result = []
+    for entry in entries:
+        # references kept by resolve_references point to an earlier feed of the run
+        first = None if "duplicate_of" in entry else seen.add(get_video_id(entry["video_url"]), yt_id)
+        if first is None:
+            result.append(entry)
+        else:
+            result.append({"video_url": entry["video_url"], "duplicate_of": first})
+    return result
+
+
+def resolve_references(entries: List[dict], feeds: Dict[str, Dict],
+                       keep: Callable[[str, str], bool]) -> List[dict]:
+    """Replace references of stored feeds (see mark_duplicates) with the entries they refer to.
+
+    A reference is valid only if the entry it refers to is in the output of a feed processed earlier
+    in the same run, e.g. the IDs of saved results can be selected and reordered (--from-json --ids),
+    deduplicated again (--dedupe) and the entries of the feeds can be limited (--number).
+
+    :param entries: list of feed entries and references of a stored feed
+    :param feeds: stored feeds by id, see Output._create_base_dict
+    :param keep: returns True if a reference (feed id, video url) is kept
+    :return: list of feed entries and kept references,
+             references to entries that are not in the stored feeds are dropped
+    """
+    result = []
+    for entry in entries:
+        target = entry.get("duplicate_of")
+        if target is None or keep(target, entry["video_url"]):
+            result.append(entry)
+            continue
+        # the referenced entry can be a reference too (results re-rendered with --dedupe)
+        visited = set()
+        while target is not None and target not in visited and target in feeds:
+            visited.add(target)
+            entry = next((e for e in feeds[target]["entries"] if e["video_url"] == entry["video_url"]), None)
+            if entry is None:
+                break
+            target = entry.get("duplicate_of")
+        if entry is not None and "duplicate_of" not in entry:
+            result.append(entry)
+    return result
+
+
+def dedupe_report(seen: Union[ExactSeenSet, HashedSeenSet]) -> str:
+    """Summary of the deduplication for the end of the run."""
+    stats = seen.stats()
+    report = f'Duplicates: {stats["duplicates"]}, unique videos: {stats["videos"]} (seen-set: {stats["backend"]}'
+    if stats["memory_bytes"] is not None:
+        report += f', {stats["memory_bytes"] / 2 ** 20:.1f} MiB' \
+                  f', estimated false-positive rate: {stats["false_positive_rate"]:.1e}'
+    if stats.get("overflow"):
+        report += f', not recorded (capacity exceeded): {stats["overflow"]}'
+    return report + ').'
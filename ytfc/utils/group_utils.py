@@ -0,0 +1,127 @@
+import os.path
+from concurrent.futures import ThreadPoolExecutor
+from json import load
+from typing import List, Dict, Tuple, Union
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from ytfc.utils.cli_utils import check_ids, check_save_files
+from ytfc.utils.metrics_utils import REQUESTS
+from ytfc.utils.output_utils import resolve_handle
+from ytfc.utils.request_utils import RequestBudget, DeadlineExceeded
+
+
+def load_manifest(path: str) -> Union[Tuple[Dict[str, Dict], None], Tuple[None, str]]:
+    """Load and check the groups of a manifest (--manifest).
+
+    Manifest: JSON object, group name -> IDs ("ids" and/or "read") and output files ("save").
+    Relative paths are relative to the directory of the manifest.
+        {
+            "news": {"read": "news.txt", "save": ["out/news.json", "out/news.html"]},
+            "music": {"ids": ["@youtube", "UCxxx"], "save": ["out/music.txt"]}
+        }
+
+    :param path: "path/to/manifest.json"
+    :return: groups {"name": {"ids": [validated IDs], "save": {file path: format}}} and None
+             or
+             None and an error message
+    """
+    with open(path, encoding='utf-8') as f:
+        try:
+            manifest = load(f)
+        except ValueError as e:
+            return None, f'The manifest {path} is not valid JSON. {e}\n'
+    if not isinstance(manifest, dict) or not manifest:
+        return None, f'The manifest {path} must be a JSON object with at least one group.\n'
+    base_dir = os.path.dirname(path)
+    groups = {}
+    all_files = []
+    for name, group in manifest.items():
+        if not isinstance(group, dict) or not (group.get("ids") or group.get("read")) or not group.get("save"):
+            return None, f'Group {name}: "ids" or "read" and "save" (a list of file paths) are required.\n'
+        if not isinstance(group.get("ids", []), list) or not isinstance(group["save"], list):
+            return None, f'Group {name}: "ids" and "save" must be lists.\n'
+        read = os.path.join(base_dir, group["read"]) if group.get("read") else None
+        if read and not os.path.isfile(read):
+            return None, f'Group {name}: the file {read} does not exist. Check that the path is entered correctly.\n'
+        invalid_ids, yt_ids = check_ids(group.get("ids"), read)
+        if invalid_ids:
+            return None, f'Group {name}: unsupported id(s): {", ".join(invalid_ids)}.\n'
+        save_files, error_message = check_save_files([os.path.join(base_dir, p) for p in group["save"]])
+        if error_message:
+            return None, f'Group {name}: {error_message}'
+        all_files.extend(save_files)
+        groups[name] = {"ids": yt_ids, "save": save_files}
+    # the same file in different groups
+    _, error_message = check_save_files(all_files)
+    if error_message:
+        return None, error_message
+    return groups, None
+
+
+def resolve_handles(ids: List[str], budget: Union[RequestBudget, None] = None, workers: int = 1) -> Dict[str, str]:
+    """Channel IDs of the @handles, so that the union of the groups is keyed by the resolved feed.
+
+    Handles that can not be resolved are left out, the run requests them again and reports the error.
+
+    :param ids: IDs of all groups, see union_ids
+    :param budget: time limits of the requests of the run (see RequestBudget) or None
+    :param workers: number of handles resolved concurrently
+    :return: {"@handle": "UCxxx"}
+    """
+    def resolve(handle):
+        try:
+            xml_url, _, _ = resolve_handle(handle, budget)
+        except (requests.exceptions.RequestException, DeadlineExceeded):
+            return handle, None
+        if xml_url is None:
+            return handle, None
+        return handle, parse_qs(urlparse(xml_url).query).get('channel_id', [None])[0]
+
+    handles = [i for i in ids if i.startswith('@')]
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        return {handle: channel_id for handle, channel_id in executor.map(resolve, handles) if channel_id}
+
+
+def union_ids(groups: Dict[str, Dict], aliases: Union[Dict[str, str], None] = None) -> List[str]:
+    """IDs of all groups, each ID once, in the order of the groups.
+
+    IDs are already canonical (see check_ids: @username is lowercased, duplicates are removed).
+    An @handle in aliases is replaced by its channel ID (see resolve_handles),
+    so a channel that is in the groups as @handle and as UCxxx is requested once.
+    """
+    aliases = aliases or {}
+    return list(dict.fromkeys(aliases.get(i, i) for group in groups.values() for i in group["ids"]))
+
+
+def group_output(output: Dict, ids: List[str], aliases: Union[Dict[str, str], None] = None) -> Dict:
+    """The output of a group from the output of all groups.
+
+    :param output: output dict of the union of the groups, see Output._create_base_dict
+    :param ids: IDs of the group
+    :param aliases: channel IDs of the resolved @handles, see resolve_handles
+    :return: output dict of the group, keyed by the IDs of the group
+    """
+    aliases = aliases or {}
+    return {
+        "created_utc": output["created_utc"],
+        "ids": ids,
+        "feeds": {i: output["feeds"][aliases.get(i, i)] for i in ids}
+    }
+
+
+def number_of_requests(ids: List[str]) -> int:
+    """Requests needed for the IDs: 2 for @username (channel page and feed), 1 for other IDs."""
+    return sum(2 if i.startswith('@') else 1 for i in ids)
+
+
+def groups_report(groups: Dict[str, Dict], aliases: Union[Dict[str, str], None] = None) -> str:
+    """Requests sent by the shared run (ytfc_requests_total, with retries and hedged requests)
+    compared with the estimates for the union of the IDs and for a separate run per group."""
+    feeds = union_ids(groups, aliases)
+    estimate = number_of_requests(union_ids(groups))
+    separate = sum(number_of_requests(group["ids"]) for group in groups.values())
+    sent = int(REQUESTS.total())
+    return f'Groups: {len(groups)}, unique feeds: {len(feeds)}. ' \
+           f'Requests: {sent} sent (estimate: {estimate}), with a separate run per group: {separate} (estimate).'
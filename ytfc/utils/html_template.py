@@ -1,10 +1,15 @@
+fonts_url = 'https://fonts.googleapis.com/css?family=Nunito+Sans|Pontano+Sans|Work+Sans|Quattrocento+Sans'
+
+# replaced with inlined fonts in offline reports (HTMLFormat with ThumbnailCache)
+fonts_link = f'<link rel="stylesheet" href="{fonts_url}">'
+
 html_begin = """<!DOCTYPE html>
 <html>
   <head>
     <title>Feeds</title>
     <meta charset="utf-8">
     <meta name="viewport" content="width=device-width">
-    <link rel="stylesheet" href="https://fonts.googleapis.com/css?family=Nunito+Sans|Pontano+Sans|Work+Sans|Quattrocento+Sans">
+    """ + fonts_link + """
     <style type="text/css">
       h1, h2 {
         margin: 10px;
@@ -129,7 +134,7 @@ html_begin = """<!DOCTYPE html>
       /* table of contents */
       /* There are no uploads in the feed */
       /* Failed to get response, UC id, feed (errors) */
-      div.yt-ids, div.no-uploads, div.no-data {
+      div.yt-ids, div.no-uploads, div.no-data, div.pages {
         margin: 10px;
         padding: 5px;
       }
@@ -142,7 +147,18 @@ html_begin = """<!DOCTYPE html>
 <script type="text/javascript">
   var currentImg = 0;
 
+  // lazy slider: frames hq1-hq3 have data-src and are fetched on first hover or click
+  function loadFrames(videoId) {
+    const elem = document.getElementById(videoId);
+    var imgs = elem.querySelectorAll('img[data-src]');
+    for (var i = 0; i < imgs.length; i++) {
+      imgs[i].src = imgs[i].dataset.src;
+      imgs[i].removeAttribute('data-src');
+    }
+  }
+
   function changeSlide(videoId, n) {
+    loadFrames(videoId);
     const elem = document.getElementById(videoId);
     var imgs = elem.getElementsByClassName('slider-img');
     var dots = elem.getElementsByClassName('dot');
@@ -174,13 +190,34 @@ html_end = """
 
 # hqdefault.jpg original: 480x360, 4:3
 # hq[number].jpg original: 480x360, 4:3
+# frames - urls or local paths of hqdefault.jpg, hq1.jpg, hq2.jpg, hq3.jpg (see HTMLFormat._frames)
 slider_block = """
 <div class="slider-container" id="{video_id}">
   <div class="slider">
-    <img class="slider-img" src="https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" width="320" height="240" />
-    <img class="slider-img" src="https://i.ytimg.com/vi/{video_id}/hq1.jpg" width="320" height="240" />
-    <img class="slider-img" src="https://i.ytimg.com/vi/{video_id}/hq2.jpg" width="320" height="240" />
-    <img class="slider-img" src="https://i.ytimg.com/vi/{video_id}/hq3.jpg" width="320" height="240" />
+    <img class="slider-img" src="{frames[0]}" width="320" height="240" />
+    <img class="slider-img" src="{frames[1]}" width="320" height="240" />
+    <img class="slider-img" src="{frames[2]}" width="320" height="240" />
+    <img class="slider-img" src="{frames[3]}" width="320" height="240" />
+  </div>
+  <div class="navigation-buttons">
+    <span class="dot active" onclick="changeSlide('{video_id}', 0)"></span>
+    <span class="dot" onclick="changeSlide('{video_id}', 1)"></span>
+    <span class="dot" onclick="changeSlide('{video_id}', 2)"></span>
+    <span class="dot" onclick="changeSlide('{video_id}', 3)"></span>
+  </div>
+</div>
+"""
+
+# Scalable report (HTMLFormat with page_size):
+# only hqdefault.jpg is requested (lazily, when scrolled into view),
+# the remaining frames are requested on the first hover over the slider.
+lazy_slider_block = """
+<div class="slider-container" id="{video_id}" onmouseenter="loadFrames('{video_id}')">
+  <div class="slider">
+    <img class="slider-img" src="{frames[0]}" width="320" height="240" loading="lazy" />
+    <img class="slider-img" data-src="{frames[1]}" width="320" height="240" loading="lazy" />
+    <img class="slider-img" data-src="{frames[2]}" width="320" height="240" loading="lazy" />
+    <img class="slider-img" data-src="{frames[3]}" width="320" height="240" loading="lazy" />
   </div>
   <div class="navigation-buttons">
     <span class="dot active" onclick="changeSlide('{video_id}', 0)"></span>
@@ -191,6 +228,11 @@ slider_block = """
 </div>
 """
 
+# navigation between the pages of a scalable report
+pages_block = """
+<div class="pages">{links}</div>
+"""
+
 buttons_block = """
 <div class="video-url">
   <button><a href="{video_url}" target="_blank" rel="noopener noreferrer nofollow">open in new tab</a></button>
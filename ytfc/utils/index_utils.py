@@ -0,0 +1,181 @@
+import sqlite3
+from datetime import datetime, timezone
+from typing import List, Dict
+
+from ytfc.utils.xml_utils import get_video_id
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    video_id TEXT NOT NULL UNIQUE,
+    video_url TEXT NOT NULL,
+    feed TEXT NOT NULL,
+    channel TEXT,
+    title TEXT,
+    description TEXT,
+    published TEXT,
+    indexed_utc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_published ON videos (published);
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5 (
+    title, description, channel,
+    content='videos', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS videos_ai AFTER INSERT ON videos BEGIN
+    INSERT INTO videos_fts (rowid, title, description, channel)
+    VALUES (new.id, new.title, new.description, new.channel);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_au AFTER UPDATE OF title, description, channel ON videos BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title, description, channel)
+    VALUES ('delete', old.id, old.title, old.description, old.channel);
+    INSERT INTO videos_fts (rowid, title, description, channel)
+    VALUES (new.id, new.title, new.description, new.channel);
+END;
+'''
+
+# a video that is already indexed is updated only when its text changed,
+# a run without --verbose (no description) keeps the indexed description
+UPSERT = '''
+INSERT INTO videos (video_id, video_url, feed, channel, title, description, published, indexed_utc)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (video_id) DO UPDATE SET
+    title = excluded.title,
+    description = COALESCE(excluded.description, videos.description),
+    channel = excluded.channel
+WHERE videos.title IS NOT excluded.title
+   OR videos.channel IS NOT excluded.channel
+   OR (excluded.description IS NOT NULL AND videos.description IS NOT excluded.description)
+'''
+
+# rank of the matches: bm25 with the weights of the columns title, description, channel,
+# stored in the FTS5 table (the rank configuration option)
+RANK = '''
+INSERT INTO videos_fts (videos_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')
+'''
+
+# the best matches are selected by FTS5 (ORDER BY rank LIMIT), then joined with their videos
+SEARCH = '''
+SELECT v.video_id, v.video_url, v.feed, v.channel, v.title, v.published, m.snippet, m.rank
+FROM (SELECT rowid, snippet(videos_fts, 1, '[', ']', '...', 12) AS snippet, rank
+      FROM videos_fts WHERE videos_fts MATCH ? ORDER BY rank LIMIT ?) AS m
+JOIN videos v ON v.id = m.rowid
+ORDER BY m.rank
+'''
+
+
+def fts_query(query: str) -> str:
+    """Quote each word of the query, so that the words are matched as they are (all words are required).
+
+    :param query: words, e.g. 'live stream'
+    :return: FTS5 query, e.g. '"live" "stream"'
+    """
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class SearchIndex:
+    """Full-text index of the fetched videos in an SQLite database (FTS5), see --index and ytfc search.
+
+    Titles, descriptions (--verbose) and channel names are indexed, each video once (by video ID).
+    Feeds are added as they are processed and committed in batches, so a run only writes its new
+    and changed videos.
+    """
+    def __init__(self, path: str, batch_size: int = 100):
+        """
+        :param path: "path/to/index.db", created if it does not exist
+        :param batch_size: feeds per transaction
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.added = 0
+        self._pending = 0
+        self._connection = None
+
+    def open(self) -> 'SearchIndex':
+        """Open the database and create the tables.
+
+        :return: self, can be used as a context manager
+        :raises sqlite3.OperationalError: the database can not be opened or SQLite is built without FTS5
+        """
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+        self._connection.execute(RANK)
+        self._connection.commit()
+        return self
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+        self._connection.commit()
+        self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_feed(self, yt_id: str, feed: Dict) -> None:
+        """Index the entries of a feed, used as Output.generate_output(on_feed=...).
+
+        :param yt_id: playlist id or channel id or @handle
+        :param feed: feed dict, see Output._create_base_dict, feeds with errors are skipped
+        :return: None
+        """
+        if feed.get("error_message"):
+            return
+        feed_info = feed["feed_info"]
+        channel = feed_info.get("channel_title") or feed_info.get("playlist_created_by")
+        indexed = f'{datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")}+00:00'
+        rows = []
+        for entry in feed["entries"]:
+            # references to other feeds (--dedupe) are indexed with the first feed
+            if "duplicate_of" in entry:
+                continue
+            description = entry.get("description")
+            if description == 'No description':
+                description = None
+            rows.append((get_video_id(entry["video_url"]), entry["video_url"], yt_id, channel,
+                         entry.get("video_title"), description, entry.get("published"), indexed))
+        if rows:
+            # rows inserted or updated, without the changes of the triggers
+            self.added += self._connection.executemany(UPSERT, rows).rowcount
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self._connection.commit()
+            self._pending = 0
+
+    def search(self, query: str, limit: int = 20, raw: bool = False) -> List[Dict]:
+        """Videos that match the query, best matches first.
+
+        :param query: words (all are required) or an FTS5 query if raw
+        :param limit: maximum number of results
+        :param raw: use the query as an FTS5 query (AND, OR, NOT, NEAR, prefix*, title: ...)
+        :return: [{"video_id", "video_url", "feed", "channel", "video_title", "published", "snippet", "rank"}]
+        :raises sqlite3.OperationalError: invalid FTS5 query
+        """
+        match = query if raw else fts_query(query)
+        if not match:
+            return []
+        rows = self._connection.execute(SEARCH, (match, limit)).fetchall()
+        keys = ("video_id", "video_url", "feed", "channel", "video_title", "published", "snippet", "rank")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def count(self) -> int:
+        return self._connection.execute('SELECT count(*) FROM videos').fetchone()[0]
+
+    def report(self) -> str:
+        return f'Search index {self.path}: {self.added} video(s) added or updated, {self.count()} in total.'
+
+
+def format_result(number: int, result: Dict) -> str:
+    """Text of a search result for ytfc search."""
+    lines = [f'{number}. {result["video_title"]}',
+             f'   {result["video_url"]}',
+             f'   {result["channel"]} ({result["feed"]}), {result["published"]}']
+    if result["snippet"]:
+        lines.append(f'   {result["snippet"]}')
+    return '\n'.join(lines)
@@ -0,0 +1,90 @@
+import gzip
+import os.path
+from datetime import datetime, timezone
+from json import load, loads
+from typing import Union, List, Dict
+
+
+# fields that are only present in verbose results
+VERBOSE_FIELDS = frozenset([
+    "channel_url", "channel_created", "playlist_creator_url", "playlist_created",
+    "views", "likes", "description", "uploaded_by", "uploader_url"
+])
+
+
+def archive_path(archive: str, yt_id: str) -> str:
+    """Path to the raw XML response of an ID in the archive directory.
+
+    Used by Output (--archive) and ArchiveOutput (--from-archive).
+
+    :param archive: directory with raw XML responses
+    :param yt_id: playlist id or channel id or @handle
+    :return: "archive/<id>.xml"
+    """
+    return os.path.join(archive, f'{yt_id}.xml')
+
+
+def archive_ids(archive: str) -> List[str]:
+    """IDs of the raw XML responses stored in the archive directory.
+
+    :param archive: directory with raw XML responses
+    :return: a list of IDs sorted by name
+    """
+    return sorted(name[:-4] for name in os.listdir(archive) if name.endswith('.xml'))
+
+
+def load_output(path: str) -> Dict:
+    """Load the results saved with --save.
+
+    JSON file - the output dict is stored as is.
+    NDJSON file (ndjson, ndjson.gz) - feeds are collected from per-feed or per-entry records,
+    the file modification time is used as "created_utc".
+
+    :param path: "path/to/file.json" or "path/to/file.ndjson" or "path/to/file.ndjson.gz"
+    :return: output dict, see Output._create_base_dict
+    """
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            return load(f)
+    modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+    feeds = {}
+    with (gzip.open(path, 'rt', encoding='utf-8') if path.endswith('.gz') else open(path, encoding='utf-8')) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = loads(line)
+            yt_id = record.pop("id")
+            if "entry" in record:
+                # per-entry record
+                entry = record.pop("entry")
+                feed = feeds.setdefault(yt_id, {"feed_info": record.pop("feed_info"), "entries": []})
+                if entry is not None:
+                    feed["entries"].append(entry)
+                feed.update(record)
+            else:
+                feeds[yt_id] = record
+    return {
+        "created_utc": f'{modified.strftime("%Y-%m-%dT%H:%M:%S")}+00:00',
+        "ids": list(feeds),
+        "feeds": feeds
+    }
+
+
+def select_feed(feed: Dict, verbose: bool, number: Union[int, None]) -> Dict:
+    """Apply --verbose and --number to a saved feed.
+
+    Verbose details can be removed from saved results, but not added.
+
+    :param feed: feed dict, see Output._create_base_dict
+    :param verbose: keep details about the feed and its entries
+    :param number: limit the number of entries for feed (up to 15)
+    :return: new feed dict
+    """
+    feed = dict(feed)
+    entries = feed["entries"][0:number] if number else feed["entries"]
+    if verbose:
+        feed["entries"] = list(entries)
+    else:
+        feed["feed_info"] = {k: v for k, v in feed["feed_info"].items() if k not in VERBOSE_FIELDS}
+        feed["entries"] = [{k: v for k, v in e.items() if k not in VERBOSE_FIELDS} for e in entries]
+    return feed
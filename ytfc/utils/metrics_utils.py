@@ -0,0 +1,152 @@
+import os
+import threading
+from bisect import bisect_left
+from typing import List, Tuple, Sequence, Union
+
+
+# latency buckets, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _labels(names: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def total(self) -> float:
+        """Sum of the values of all labels."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f'{self.name}{_labels(self.labelnames, k)} {v}' for k, v in values]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+    kind = 'gauge'
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        with self._lock:
+            self._values[labelvalues] = value
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels: [count per bucket (not cumulative, +Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            item = self._values.get(labelvalues)
+            if item is None:
+                item = self._values[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            item[0][index] += 1
+            item[1] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+        lines = []
+        for labelvalues, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                le = _labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f'{self.name}_bucket{le} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labelvalues)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}')
+        return lines
+
+
+REGISTRY: List[Union[Counter, Gauge, Histogram]] = []
+
+REQUESTS = Counter('ytfc_requests_total',
+                   'Requests to YouTube by status code: 200, 404, other (any other status), '
+                   'error (timeouts and connection errors).', ['code'])
+DOWNLOADED_BYTES = Counter('ytfc_downloaded_bytes_total', 'Bytes of the responses from YouTube.')
+PARSE_FAILURES = Counter('ytfc_parse_failures_total', 'Responses that lxml failed to parse.', ['response'])
+ENTRIES = Counter('ytfc_entries_total', 'Feed entries emitted.')
+FEEDS = Counter('ytfc_feeds_total', 'Processed IDs by result: ok or error.', ['result'])
+PHASE_SECONDS = Histogram('ytfc_phase_seconds',
+                          'Latency of the phases of a feed: resolve (@handle page), fetch (XML feed), parse.',
+                          ['phase'])
+CACHE_REQUESTS = Counter('ytfc_cache_requests_total', 'Cache lookups by cache and result: hit or miss.',
+                         ['cache', 'result'])
+CACHE_HIT_RATIO = Gauge('ytfc_cache_hit_ratio', 'Share of cache lookups that were hits.', ['cache'])
+NOTIFICATIONS = Counter('ytfc_notifications_total',
+                        'New video events by sink (webhook, sse) and result: delivered, failed, dropped.',
+                        ['sink', 'result'])
+PROXY_REQUESTS = Counter('ytfc_proxy_requests_total',
+                         'Requests through a proxy by result: ok, throttled, server_error, timeout, '
+                         'connection_error, error.', ['proxy', 'result'])
+PROXY_HEALTH = Gauge('ytfc_proxy_health', 'Health score of a proxy, 0-1 (0 - out of rotation or on probation).',
+                     ['proxy'])
+
+
+def cache_lookup(cache: str, hit: bool, hits: int, misses: int) -> None:
+    """Count a cache lookup and update the hit ratio of the cache.
+
+    :param cache: name of the cache, e.g. feeds, handles, thumbnails
+    :param hit: the value was found in the cache
+    :param hits: all hits of the cache, including this lookup
+    :param misses: all misses of the cache, including this lookup
+    :return: None
+    """
+    CACHE_REQUESTS.inc(cache, 'hit' if hit else 'miss')
+    CACHE_HIT_RATIO.set(hits / (hits + misses), cache)
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        lines.extend(metric.samples())
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path: str) -> None:
+    """Write all metrics to a file, e.g. for the textfile collector of node_exporter.
+
+    The file is replaced atomically, so a collector never reads a partially written file.
+
+    :param path: "path/to/file.prom"
+    :return: None
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(render())
+    os.replace(tmp_path, path)
@@ -0,0 +1,252 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import List, Dict, Union
+
+import requests
+
+from ytfc.utils.metrics_utils import NOTIFICATIONS
+from ytfc.utils.xml_utils import get_video_id
+
+
+class VideoTracker:
+    """Video IDs already seen in each feed, to detect new videos.
+
+    The first time a feed is seen, its videos are recorded without events,
+    so that only videos published after that are reported as new.
+    The state can be kept in a JSON file between runs: {"<feed id>": ["<video id>", ...]}.
+    The videos of undelivered events are not saved, so the next run reports them again.
+    """
+    # video IDs kept per feed, a feed contains up to 15 entries
+    max_per_feed = 200
+
+    def __init__(self, path: Union[str, None] = None):
+        """
+        :param path: "path/to/state.json" or None (in memory only)
+        """
+        self.path = path
+        self.known = {}
+        self._lock = threading.Lock()
+        if path and os.path.isfile(path):
+            with open(path, encoding='utf-8') as f:
+                self.known = {k: deque(v, maxlen=self.max_per_feed) for k, v in json.load(f).items()}
+
+    def new_videos(self, yt_id: str, feed: Dict) -> List[Dict]:
+        """Events for the videos of the feed that were not seen before.
+
+        Event: {"feed": "<id>", "video_id": "...", "video_url": "...", "video_title": "...",
+                "published": "...", "author": "<channel title or playlist creator>", "detected_utc": "..."}
+
+        :param yt_id: playlist id or channel id or @handle
+        :param feed: feed dict, see Output._create_base_dict, feeds with errors are skipped
+        :return: events, oldest first
+        """
+        if feed.get("error_message"):
+            return []
+        # references to other feeds (--dedupe) are reported by the first feed
+        entries = [e for e in feed["entries"] if "duplicate_of" not in e]
+        with self._lock:
+            known = self.known.get(yt_id)
+            first_time = known is None
+            if first_time:
+                known = self.known[yt_id] = deque(maxlen=self.max_per_feed)
+            seen = set(known)
+            new = []
+            # entries are newest first
+            for entry in reversed(entries):
+                video_id = get_video_id(entry["video_url"])
+                if video_id not in seen:
+                    seen.add(video_id)
+                    known.append(video_id)
+                    new.append((video_id, entry))
+        if first_time:
+            return []
+        feed_info = feed["feed_info"]
+        author = feed_info.get("channel_title") or feed_info.get("playlist_created_by")
+        detected = f'{datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")}+00:00'
+        return [{"feed": yt_id, "video_id": video_id, "video_url": entry["video_url"],
+                 "video_title": entry.get("video_title"), "published": entry.get("published"),
+                 "author": author, "detected_utc": detected} for video_id, entry in new]
+
+    def save(self, undelivered: Union[List[Dict], None] = None) -> None:
+        """Write the state file.
+
+        :param undelivered: events that were not delivered (see Notifier.undelivered) or None,
+                            their videos are left out of the file, but stay known in memory
+        :return: None
+        """
+        if not self.path:
+            return
+        skip = {(event["feed"], event["video_id"]) for event in undelivered or []}
+        with self._lock:
+            state = {k: [i for i in v if (k, i) not in skip] for k, v in self.known.items()}
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+
+class Notifier:
+    """Delivery of new video events to webhooks and Server-Sent Events subscribers.
+
+    Webhooks: events are collected for batch_interval seconds (up to max_batch events, repeated events
+    are coalesced) and POSTed as {"events": [...]}. Connection errors, timeouts, 429 and 5xx responses are
+    retried with exponential backoff (Retry-After is respected up to max_delay), other responses are not retried.
+    Events that are not delivered to all webhooks yet are kept (up to max_undelivered, see undelivered).
+
+    Subscribers (see subscribe) get each event as soon as it is published.
+    A subscriber that does not read its events loses the events that do not fit in its queue.
+    """
+    # maximum seconds between the attempts to deliver a batch
+    max_delay = 60.0
+    # undelivered events kept, the oldest are dropped
+    max_undelivered = 10000
+
+    def __init__(self, webhooks: List[str], batch_interval: float = 1.0, max_batch: int = 100,
+                 retries: int = 5, backoff: float = 1.0, timeout: float = 10):
+        """
+        :param webhooks: URLs to POST the batches of events to
+        :param batch_interval: seconds to collect events before sending a batch
+        :param max_batch: maximum number of events in a batch
+        :param retries: attempts to deliver a batch to a webhook
+        :param backoff: seconds before the first retry, doubled for each next retry (up to 60 s)
+        :param timeout: timeout of a webhook request, seconds
+        """
+        self.webhooks = webhooks
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._queue = queue.Queue()
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._event_id = 0
+        # (feed, video id): event, queued or failed
+        self._undelivered = {}
+        self.delivered = 0
+        self.failed = 0
+        self._worker = None
+        if webhooks:
+            self._worker = threading.Thread(target=self._run, name='ytfc-webhooks', daemon=True)
+            self._worker.start()
+
+    def publish(self, events: List[Dict]) -> None:
+        """Send events to the subscribers and queue them for the webhooks."""
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+            numbered = []
+            for event in events:
+                self._event_id += 1
+                numbered.append((self._event_id, event))
+        for subscriber in subscribers:
+            for item in numbered:
+                try:
+                    subscriber.put_nowait(item)
+                except queue.Full:
+                    NOTIFICATIONS.inc('sse', 'dropped')
+        if self._worker is not None:
+            with self._lock:
+                for event in events:
+                    self._undelivered[(event["feed"], event["video_id"])] = event
+                while len(self._undelivered) > self.max_undelivered:
+                    del self._undelivered[next(iter(self._undelivered))]
+            for event in events:
+                self._queue.put(event)
+
+    def subscribe(self, maxsize: int = 1000) -> queue.Queue:
+        """Queue of (event number, event) for a Server-Sent Events stream."""
+        subscriber = queue.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def undelivered(self) -> List[Dict]:
+        """Events not delivered to all webhooks: queued, being sent or failed."""
+        with self._lock:
+            return list(self._undelivered.values())
+
+    def _next_batch(self) -> Union[List[Dict], None]:
+        """Events collected for batch_interval seconds after the first one, None - closed."""
+        event = self._queue.get()
+        if event is None:
+            return None
+        batch = {(event["feed"], event["video_id"]): event}
+        end = time.monotonic() + self.batch_interval
+        while len(batch) < self.max_batch:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if event is None:
+                # deliver what is collected, then stop
+                self._queue.put(None)
+                break
+            batch[(event["feed"], event["video_id"])] = event
+        return list(batch.values())
+
+    def _post(self, url: str, batch: List[Dict]) -> bool:
+        delay = self.backoff
+        for attempt in range(self.retries):
+            try:
+                r = self.session.post(url, json={"events": batch}, timeout=self.timeout)
+                if r.status_code < 300:
+                    return True
+                if r.status_code != 429 and r.status_code < 500:
+                    return False
+                retry_after = r.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = min(self.max_delay, max(delay, int(retry_after)))
+            except requests.exceptions.RequestException:
+                pass
+            if attempt < self.retries - 1:
+                time.sleep(delay)
+                delay = min(self.max_delay, delay * 2)
+        return False
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            delivered = True
+            for url in self.webhooks:
+                if self._post(url, batch):
+                    self.delivered += len(batch)
+                    NOTIFICATIONS.inc('webhook', 'delivered', amount=len(batch))
+                else:
+                    delivered = False
+                    self.failed += len(batch)
+                    NOTIFICATIONS.inc('webhook', 'failed', amount=len(batch))
+            if delivered:
+                with self._lock:
+                    for event in batch:
+                        self._undelivered.pop((event["feed"], event["video_id"]), None)
+
+    def close(self, timeout: Union[float, None] = None) -> None:
+        """Deliver the queued events and stop the webhook worker.
+
+        :param timeout: seconds to wait for the delivery or None (no limit)
+        :return: None
+        """
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join(timeout)
+            self._worker = None
+
+    def report(self) -> str:
+        return f'Webhooks: {self.delivered} event(s) delivered, {self.failed} not delivered (counted per webhook).'
@@ -1,17 +1,73 @@
+import gzip
+import os.path
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from datetime import datetime, timezone
-from typing import Union, List, Dict
-from json import dump
+from pathlib import Path
+from urllib.request import pathname2url
+from typing import Union, List, Dict, Callable, Tuple, Iterator
+from json import dump, dumps
 
-from ytfc.utils.request_utils import make_request
-from ytfc.utils.xml_utils import XMLHandler
-from ytfc.utils.html_template import html_begin, html_end, slider_block, buttons_block
+from ytfc.utils.dedupe_utils import ExactSeenSet, HashedSeenSet, mark_duplicates, resolve_references
+from ytfc.utils.input_utils import archive_path, select_feed
+from ytfc.utils.metrics_utils import PHASE_SECONDS, ENTRIES, FEEDS
+from ytfc.utils.request_utils import make_request, RequestBudget, DeadlineExceeded
+from ytfc.utils.settings import YOUTUBE_URL, THUMBNAIL_URL, THUMBNAIL_FRAMES
+from ytfc.utils.thumbnail_utils import ThumbnailCache
+from ytfc.utils.xml_utils import XMLHandler, get_video_id
+from ytfc.utils.html_template import (html_begin, html_end, slider_block, lazy_slider_block,
+                                     buttons_block, pages_block, fonts_url, fonts_link)
+
+
+def resolve_handle(handle: str, budget: Union[RequestBudget, None] = None) -> Tuple[Union[str, None],
+                                                                                    Union[str, None],
+                                                                                    Union[str, None]]:
+    """Get the feed url of the channel from https://www.youtube.com/@username.
+
+    :param handle: @handle
+    :param budget: time limits of the requests (see RequestBudget) or None
+    :return: feed url or None, error message of the feed (see Output._create_base_dict) or None,
+             details of the request error or None
+    """
+    url = Output.feed_url(handle)
+    r_text, status_code, error_msg = make_request(url, 'text', budget)
+    if r_text is None:
+        return None, f'Failed to get data from: {url}', error_msg
+    xml_url = XMLHandler().get_channel_xml_link(r_text)
+    if not xml_url:
+        # parsing errors or id not found in html response
+        return None, f'Failed to get channel id UCxxx for: {url}', None
+    return xml_url, None, None
 
 
 class Output:
-    def __init__(self, ids: List[str]):
+    def __init__(self, ids: List[str], archive: Union[str, None] = None,
+                 seen: Union[ExactSeenSet, HashedSeenSet, None] = None,
+                 budget: Union[RequestBudget, None] = None, workers: int = 1,
+                 resumed: Union[Dict[str, Dict], None] = None):
+        """
+        :param ids: a list of IDs
+        :param archive: directory to save raw XML responses (see ArchiveOutput) or None
+        :param seen: seen-set to replace repeated videos with references (see mark_duplicates) or None
+        :param budget: time limits of the requests (see RequestBudget) or None
+        :param workers: number of feeds requested concurrently, the output keeps the order of the IDs
+        :param resumed: feeds of the IDs completed by a previous run (see checkpoint_utils) or None,
+                        they are used instead of requesting the feeds again
+        """
         self.xml_handler = XMLHandler()
         self.ids = ids
         self.output = None
+        self.archive = archive
+        self.seen = seen
+        self.budget = budget
+        self.workers = workers
+        self.resumed = resumed or {}
+        self._positions = {i: n for n, i in enumerate(ids)}
+        # IDs without data because of the deadline
+        self.deadline_exceeded = set()
 
     def _create_base_dict(self) -> Dict:
         """Create dict to save feeds.
@@ -54,7 +110,8 @@ class Output:
             "published": "...",
             "views": "...", # verbose
             "likes": "...", # verbose
-            "description": "..." or "No description" # verbose
+            "description": "..." or "No description", # verbose
+            "uploaded_by": "...", "uploader_url": "..." # verbose, entries of a playlist feed
             }
 
         :return: dict
@@ -66,87 +123,241 @@ class Output:
         }
         return base_dict
 
-    def generate_output(self, *, verbose: bool, number: Union[int, None], no_print: bool, save: bool) -> None:
+    @staticmethod
+    def feed_url(channel_or_playlist_id: str) -> str:
+        """The first URL requested for the id."""
+        if channel_or_playlist_id.startswith('@'):
+            return f'{YOUTUBE_URL}/{channel_or_playlist_id}'
+        elif channel_or_playlist_id.startswith('UC'):
+            return f'{YOUTUBE_URL}/feeds/videos.xml?channel_id={channel_or_playlist_id}'
+        return f'{YOUTUBE_URL}/feeds/videos.xml?playlist_id={channel_or_playlist_id}'
+
+    def _resolve_handle(self, handle: str, feed: Dict) -> Tuple[Union[str, None], Union[str, None]]:
+        """Get the feed url of the channel from https://www.youtube.com/@username.
+
+        If requests or parsing errors, the error message is added to the feed dict.
+
+        :param handle: @handle
+        :param feed: feed dict, see _create_base_dict
+        :return: feed url or None, details of the request error or None
+        """
+        xml_url, error_message, error_msg = resolve_handle(handle, self.budget)
+        if error_message:
+            feed.update({"error_message": error_message})
+        return xml_url, error_msg
+
+    def _get_feed_content(self, channel_or_playlist_id: str,
+                          feed: Dict) -> Tuple[Union[bytes, None], Union[str, None], Union[str, None]]:
+        """Request the XML feed of a single id.
+
+        If requests or parsing errors, the error message is added to the feed dict.
+        Nothing is printed here (except lxml errors), so the feeds can be requested concurrently.
+
+        :param channel_or_playlist_id: playlist id or channel id or @handle
+        :param feed: feed dict, see _create_base_dict
+        :return: XML response or None, feed url or None, details of the request error or None
+        """
+        if channel_or_playlist_id.startswith('@'):
+            start = time.perf_counter()
+            xml_url, error_msg = self._resolve_handle(channel_or_playlist_id, feed)
+            PHASE_SECONDS.observe(time.perf_counter() - start, 'resolve')
+            if xml_url is None:
+                return None, None, error_msg
+        else:
+            xml_url = self.feed_url(channel_or_playlist_id)
+        start = time.perf_counter()
+        r_content, status_code, error_msg = make_request(xml_url, 'content', self.budget)
+        PHASE_SECONDS.observe(time.perf_counter() - start, 'fetch')
+        if r_content is None:
+            feed.update({"error_message": f'Failed to get data from: {xml_url}'})
+            return None, xml_url, error_msg
+        if self.archive:
+            # raw responses for --from-archive
+            with open(archive_path(self.archive, channel_or_playlist_id), 'wb') as f:
+                f.write(r_content)
+        return r_content, xml_url, None
+
+    def _fetch(self, channel_or_playlist_id: str) -> Tuple[Dict, Union[bytes, None], Union[str, None],
+                                                           Union[str, None]]:
+        """Request the XML feed of a single id within the time limits of the run.
+
+        :param channel_or_playlist_id: playlist id or channel id or @handle
+        :return: feed dict, XML response or None, feed url or None, details of the request error or None
+        """
+        feed = {"feed_info": {}, "entries": []}
+        try:
+            return (feed, *self._get_feed_content(channel_or_playlist_id, feed))
+        except DeadlineExceeded as e:
+            self.deadline_exceeded.add(channel_or_playlist_id)
+            feed.update({"error_message": f'Deadline exceeded, no data from: {e.url}'})
+            return feed, None, e.url, f'{e}\n'
+
+    def _prefetch(self) -> Iterator[Tuple[str, Union[Tuple, None]]]:
+        """IDs in the original order and the results of _fetch, requested by self.workers threads.
+
+        Only a limited number of feeds are requested ahead of the feed being processed.
+        Resumed IDs are not requested.
+
+        :return: (id, result of _fetch or None - not requested yet)
+        """
+        if self.workers == 1:
+            for channel_or_playlist_id in self.ids:
+                yield channel_or_playlist_id, None
+            return
+        ids = iter(self.ids)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            def submit(i):
+                return i, None if i in self.resumed else executor.submit(self._fetch, i)
+
+            pending = deque(submit(i) for i in islice(ids, self.workers * 2))
+            while pending:
+                channel_or_playlist_id, future = pending.popleft()
+                for i in islice(ids, 1):
+                    pending.append(submit(i))
+                try:
+                    yield channel_or_playlist_id, future.result() if future is not None else None
+                except BaseException:
+                    for _, f in pending:
+                        if f is not None:
+                            f.cancel()
+                    raise
+
+    @staticmethod
+    def _print_feed(feed: Dict) -> None:
+        """Print feed info and entries (or info message) of a parsed feed."""
+        for k, v in feed["feed_info"].items():
+            print(f'{k.replace("_", " ")}: {v}')
+        print()
+        if feed.get("info_message"):
+            print(f'{feed["info_message"]}\n')
+        for i in feed["entries"]:
+            for k, v in i.items():
+                print(f'{k.replace("_", " ")}: {v}')
+            print()
+
+    def _resumed_feed(self, channel_or_playlist_id: str, verbose: bool, number: Union[int, None],
+                      no_print: bool) -> Dict:
+        """The stored feed of an id (resumed or saved results), printed the same way as a requested feed."""
+        feed = dict(self.resumed[channel_or_playlist_id])
+        # references are kept only to entries in the output of earlier feeds of this run (--number),
+        # --dedupe derives all references again
+        position = self._positions[channel_or_playlist_id]
+        feed["entries"] = resolve_references(
+            feed["entries"], self.resumed,
+            lambda target, video_url: self.seen is None and self._positions.get(target, position) < position
+            and any(e["video_url"] == video_url and "duplicate_of" not in e
+                    for e in self.output["feeds"][target]["entries"]))
+        feed = select_feed(feed, verbose, number)
+        if self.seen is not None:
+            # videos of the resumed feeds are added to the seen-set
+            feed["entries"] = mark_duplicates(self.seen, channel_or_playlist_id, feed["entries"])
+        if not no_print:
+            print(f'\n=== {channel_or_playlist_id} ===\n')
+            if feed["feed_info"]:
+                self._print_feed(feed)
+        if feed.get("error_message"):
+            print(f'{feed["error_message"]}\n')
+        return feed
+
+    def _process_id(self, channel_or_playlist_id: str, verbose: bool, number: Union[int, None],
+                    no_print: bool, fetched: Union[Tuple, None] = None) -> Dict:
+        """Request and parse the feed of a single id.
+
+        :param channel_or_playlist_id: playlist id or channel id or @handle
+        :param verbose: get more details about the feed and its entries
+        :param number: limit the number of entries for the feed (up to 15)
+        :param no_print: print feed info and entries or not
+        :param fetched: result of _fetch if the feed was requested in advance (see _prefetch) or None
+        :return: feed dict, see _create_base_dict
+        """
+        if channel_or_playlist_id in self.resumed:
+            return self._resumed_feed(channel_or_playlist_id, verbose, number, no_print)
+        if not no_print:
+            print(f'\n=== {channel_or_playlist_id} ===\n')
+        feed, r_content, xml_url, error_msg = fetched or self._fetch(channel_or_playlist_id)
+        # if requests errors, prints error message
+        if r_content is None:
+            if not no_print and error_msg:
+                print(error_msg)
+            print(f'{feed["error_message"]}\n')
+            return feed
+        start = time.perf_counter()
+        root = self.xml_handler.get_xml_feed(r_content)
+        if root is not None:
+            # feed info: CHANNEL FEED, PLAYLIST FEED
+            feed["feed_info"] = self.xml_handler.get_feed_info(root, verbose)  # dict
+            entries = self.xml_handler.get_feed_videos(root, verbose, number)  # list of dicts
+            PHASE_SECONDS.observe(time.perf_counter() - start, 'parse')
+            if self.seen is not None:
+                entries = mark_duplicates(self.seen, channel_or_playlist_id, entries)
+            if not entries:
+                feed.update({"info_message": "There are no uploads in the feed."})
+            else:
+                feed["entries"] = entries
+            if not no_print:
+                self._print_feed(feed)
+        else:
+            # parsing errors
+            feed.update({"error_message": f'Failed to get feed from: {xml_url}'})
+            print(f'Failed to get feed from: {xml_url}\n')
+        return feed
+
+    def generate_output(self, *, verbose: bool, number: Union[int, None], no_print: bool, save: bool,
+                        on_feed: Union[Callable[[str, Dict], None], None] = None) -> None:
         """Display and store the results of feed parsing for list of ids.
 
         :param verbose: get more details about the feed and its entries
         :param number: limit the number of entries for each feed (up to 15)
         :param no_print: print feed info and entries or not
         :param save: save feed info and entries to self.output or not
+        :param on_feed: called with the id and the feed dict as soon as the feed is processed
+                        (e.g. NDJSONFormat.write_feed for streaming output)
         :return: None
         """
-        if not save and no_print:
+        if not save and no_print and on_feed is None:
             raise ValueError(f'Invalid argument combination: save={save}, no_print={no_print}. '
                              'Not saving and not printing output at the same time')
         if save:
             self.output = self._create_base_dict()
-        for channel_or_playlist_id in self.ids:
-            if not no_print:
-                print(f'\n=== {channel_or_playlist_id} ===\n')
-            if channel_or_playlist_id.startswith('@'):
-                r_text, status_code, error_msg = make_request(f'https://www.youtube.com/{channel_or_playlist_id}', 'text')
-                # if requests errors, prints error message
-                if r_text is None:
-                    if save:
-                        self.output["feeds"][channel_or_playlist_id].update(
-                            {"error_message": f'Failed to get data from: https://www.youtube.com/{channel_or_playlist_id}'})
-                    if not no_print:
-                        print(error_msg)
-                    print(f'Failed to get data from: https://www.youtube.com/{channel_or_playlist_id}\n')
-                    continue
-                xml_url = self.xml_handler.get_channel_xml_link(r_text)
-                if not xml_url:
-                    # parsing errors or id not found in html response
-                    if save:
-                        self.output["feeds"][channel_or_playlist_id].update(
-                            {"error_message": f'Failed to get channel id UCxxx for: https://www.youtube.com/{channel_or_playlist_id}'})
-                    print(f'Failed to get channel id UCxxx for: https://www.youtube.com/{channel_or_playlist_id}\n')
-                    continue
-            elif channel_or_playlist_id.startswith('UC'):
-                xml_url = f'https://www.youtube.com/feeds/videos.xml?channel_id={channel_or_playlist_id}'
-            else:
-                xml_url = f'https://www.youtube.com/feeds/videos.xml?playlist_id={channel_or_playlist_id}'
-            r_content, status_code, error_msg = make_request(xml_url, 'content')
-            # if requests errors, prints error message
-            if r_content is None:
-                if save:
-                    self.output["feeds"][channel_or_playlist_id].update(
-                        {"error_message": f'Failed to get data from: {xml_url}'})
-                if not no_print:
-                    print(error_msg)
-                print(f'Failed to get data from: {xml_url}\n')
-                continue
-            root = self.xml_handler.get_xml_feed(r_content)
-            if root is not None:
-                # feed info: CHANNEL FEED, PLAYLIST FEED
-                info = self.xml_handler.get_feed_info(root, verbose)  # dict
-                if save:
-                    self.output["feeds"][channel_or_playlist_id]["feed_info"] = info
-                if not no_print:
-                    for k, v in info.items():
-                        print(f'{k.replace("_", " ")}: {v}')
-                    print()
-                entries = self.xml_handler.get_feed_videos(root, verbose, number)  # list of dicts
-                if not entries:
-                    if save:
-                        self.output["feeds"][channel_or_playlist_id].update(
-                            {"info_message": "There are no uploads in the feed."})
-                    if not no_print:
-                        print('There are no uploads in the feed.\n')
-                else:
-                    if save:
-                        self.output["feeds"][channel_or_playlist_id]["entries"] = entries
-                    if not no_print:
-                        for i in entries:
-                            for k, v in i.items():
-                                print(f'{k.replace("_", " ")}: {v}')
-                            print()
-            else:
-                # parsing errors
-                if save:
-                    self.output["feeds"][channel_or_playlist_id].update(
-                        {"error_message": f'Failed to get feed from: {xml_url}'})
-                print(f'Failed to get feed from: {xml_url}\n')
+        for channel_or_playlist_id, fetched in self._prefetch():
+            feed = self._process_id(channel_or_playlist_id, verbose, number, no_print, fetched)
+            FEEDS.inc('error' if feed.get("error_message") else 'ok')
+            ENTRIES.inc(amount=len(feed["entries"]))
+            if save:
+                self.output["feeds"][channel_or_playlist_id] = feed
+            if on_feed is not None:
+                on_feed(channel_or_playlist_id, feed)
+
+
+class ArchiveOutput(Output):
+    """Parse raw XML responses saved with Output(archive=...) instead of requesting feeds."""
+    def _get_feed_content(self, channel_or_playlist_id: str,
+                          feed: Dict) -> Tuple[Union[bytes, None], Union[str, None], Union[str, None]]:
+        path = archive_path(self.archive, channel_or_playlist_id)
+        if not os.path.isfile(path):
+            feed.update({"error_message": f'Failed to get data from: {path}'})
+            return None, path, None
+        with open(path, 'rb') as f:
+            return f.read(), path, None
+
+
+class SavedOutput(Output):
+    """Re-render saved results (see input_utils.load_output) instead of requesting feeds."""
+    def __init__(self, ids: List[str], saved: Dict, seen: Union[ExactSeenSet, HashedSeenSet, None] = None):
+        """
+        :param ids: a list of IDs, all of them must be in saved["feeds"]
+        :param saved: output dict loaded from a JSON or NDJSON file
+        :param seen: seen-set to replace repeated videos with references (see mark_duplicates) or None
+        """
+        # all feeds are taken from the saved results (see Output._resumed_feed)
+        super().__init__(ids, seen=seen, resumed=saved["feeds"])
+        self.saved = saved
+
+    def _create_base_dict(self) -> Dict:
+        base_dict = super()._create_base_dict()
+        # the results were created when the feeds were requested
+        base_dict["created_utc"] = self.saved["created_utc"]
+        return base_dict
 
 
 class TXTFormat:
@@ -183,87 +394,227 @@ class TXTFormat:
 
 
 class HTMLFormat:
+    def __init__(self, page_size: Union[int, None] = None, cache: Union[ThumbnailCache, None] = None):
+        """
+        :param page_size: number of feeds per page for a scalable report or None (single page)
+                          A scalable report is split into an index page (filename) and
+                          page files (see page_filename), thumbnails are loaded lazily.
+        :param cache: thumbnail cache for an offline report or None
+                      Thumbnails are downloaded to the cache and referenced as local files,
+                      fonts are inlined.
+        """
+        self.page_size = page_size
+        self.cache = cache
+        self._html_begin = html_begin
+        self._local_frames = {}
+        self._report_dir = '.'
+
+    @staticmethod
+    def page_filename(filename: str, page: int) -> str:
+        """File name of a page of the scalable report.
+
+        :param filename: "path/to/file.html", args.save value
+        :param page: page number, starting from 1
+        :return: "path/to/file-<page>.html"
+        """
+        root, ext = os.path.splitext(filename)
+        return f'{root}-{page}{ext}'
+
+    @staticmethod
+    def number_of_pages(number_of_ids: int, page_size: int) -> int:
+        return max(1, -(-number_of_ids // page_size))
+
+    def _frame_urls(self, video_id: str) -> List[str]:
+        thumbnail_url = self.cache.thumbnail_url if self.cache else THUMBNAIL_URL
+        return [thumbnail_url.format(video_id=video_id, frame=frame) for frame in THUMBNAIL_FRAMES]
+
+    def _frames(self, video_id: str) -> List[str]:
+        """Sources of the slider images: local files (offline report) or urls (frames that are not cached)."""
+        frames = []
+        for url in self._frame_urls(video_id):
+            path = self._local_frames.get(url)
+            if path is None:
+                frames.append(url)
+                continue
+            try:
+                frames.append(pathname2url(os.path.relpath(path, self._report_dir)))
+            except ValueError:
+                # on Windows, the cache and the report can be on different drives
+                frames.append(Path(path).resolve().as_uri())
+        return frames
+
+    def _prepare_offline(self, filename: str, output: dict) -> None:
+        """Download thumbnails and fonts to the cache before writing an offline report."""
+        self._report_dir = os.path.dirname(os.path.abspath(filename))
+        css = self.cache.inline_fonts(fonts_url)
+        if css is not None:
+            self._html_begin = html_begin.replace(fonts_link, f'<style type="text/css">\n{css}\n</style>')
+        urls = [url for feed in output["feeds"].values() for entry in feed["entries"]
+                if "duplicate_of" not in entry for url in self._frame_urls(get_video_id(entry["video_url"]))]
+        # the same video can be in several feeds
+        self._local_frames = self.cache.fetch_all(list(dict.fromkeys(urls)))
+        self.cache.evict()
+
+    @staticmethod
+    def _reference(yt_id: str, links: Dict[str, str]) -> str:
+        """Link to the feed of the first occurrence of a video, plain text if the feed is not in the report."""
+        if yt_id in links:
+            return f'<a href="{links[yt_id]}">{yt_id}</a>'
+        return yt_id
+
+    def _feed_block(self, html_id: str, yt_id: str, v: dict, slider: str, links: Dict[str, str]) -> str:
+        """Render the feed info and entries of a single ID.
+
+        The parts are joined and written with a single call.
+
+        :param html_id: anchor of the feed on the page
+        :param yt_id: channel or playlist ID
+        :param v: feed dict, output["feeds"][yt_id]
+        :param slider: slider_block or lazy_slider_block
+        :param links: links to the feeds in the report, for references to repeated videos (--dedupe)
+        :return: HTML fragment
+        """
+        parts = [f'<h2 id="{html_id}">{yt_id}</h2>\n']
+        verbose = len(v["feed_info"]) > 3
+        # feed info: CHANNEL FEED, PLAYLIST FEED
+        if v["feed_info"]:
+            parts.append(f'<div class="feed-info"><div>feed type: {v["feed_info"]["feed_type"]}</div>')
+            parts.append(f'<div>feed title: {v["feed_info"]["feed_title"]}</div>')
+            if v["feed_info"].get("channel_title"):
+                parts.append(f'<div>channel title: {v["feed_info"]["channel_title"]}</div>')
+                if verbose:
+                    parts.append(f'<div>channel url: <a href="{v["feed_info"]["channel_url"]}" target="_blank" '
+                                 f'rel="noopener noreferrer nofollow">{v["feed_info"]["channel_url"]}</a></div>')
+                    parts.append(f'<div>channel created: {v["feed_info"]["channel_created"]}</div>')
+            if v["feed_info"].get("playlist_created_by"):
+                parts.append(f'<div>playlist created by: {v["feed_info"]["playlist_created_by"]}</div>')
+                if verbose:
+                    parts.append(f'<div>playlist creator url: <a href="{v["feed_info"]["playlist_creator_url"]}" '
+                                 'target="_blank" rel="noopener noreferrer nofollow">'
+                                 f'{v["feed_info"]["playlist_creator_url"]}</a></div>')
+                    parts.append(f'<div>playlist created: {v["feed_info"]["playlist_created"]}</div>')
+            parts.append('</div><br>\n')  # close feed-info
+        for entry in v["entries"]:
+            if "duplicate_of" in entry:
+                # reference to the first occurrence of the video, no thumbnails
+                parts.append(f'<div class="video-block duplicate"><div>video url: <a href="{entry["video_url"]}" '
+                             f'target="_blank" rel="noopener noreferrer nofollow">{entry["video_url"]}</a></div>'
+                             f'<div>duplicate of: {self._reference(entry["duplicate_of"], links)}</div>'
+                             f'<br></div>\n')
+                continue
+            # video block:
+            # thumbnail, video url (buttons), video title, published, views, likes, description
+            parts.append('<div class="video-block">\n')
+            # thumbnail
+            # In xml - https://i[number].ytimg.com/vi/VIDEO_ID/hqdefault.jpg (480x360).
+            # hqdefault.jpg - this is a thumbnail, or the first frame of the video.
+            # frames used in html: hqdefault.jpg, hq1.jpg, hq2.jpg, hq3.jpg
+            video_id = get_video_id(entry["video_url"])
+            parts.append(slider.format(video_id=video_id, frames=self._frames(video_id)))
+            # url
+            parts.append(buttons_block.format(video_url=entry["video_url"]))
+            # title
+            parts.append(f'<div class="video-title">{entry["video_title"]}</div>\n')
+            # published
+            parts.append(f'<div>published: {entry["published"]}</div>')
+            if verbose:
+                # views
+                parts.append(f'\n<div>views: {entry["views"]}</div>')
+                # likes
+                parts.append(f'<div>likes: {entry["likes"]}</div>\n')
+                # uploader of a video of a playlist
+                if entry.get("uploaded_by"):
+                    parts.append(f'<div>uploaded by: <a href="{entry["uploader_url"]}" target="_blank" '
+                                 f'rel="noopener noreferrer nofollow">{entry["uploaded_by"]}</a></div>\n')
+                # description
+                if entry["description"] == 'No description':
+                    parts.append(f'<div>description: {entry["description"]}</div>')
+                else:
+                    parts.append(
+                        '<div class="description-popup" onclick="showPopup(event)">show/hide description'
+                        f'<span class="popup-text">{entry["description"]}</span></div>')
+            parts.append('<br></div>\n')  # close video-block
+        # There are no uploads in the feed.
+        if v.get("info_message"):
+            parts.append(f'<div class="no-uploads">{v["info_message"]}</div><br>\n')
+        # 'Failed to get data from: ', 'Failed to get channel id UCxxx for: ', 'Failed to get feed from: '
+        if v.get("error_message"):
+            u = v["error_message"].partition(": ")
+            parts.append(f'<div class="no-data">{u[0]}: <a href="{u[2]}" '
+                         f'target="_blank" rel="noopener noreferrer nofollow">{u[2]}</a></div><br>\n')
+        return ''.join(parts)
+
     def save_to_file(self, filename: str, output: dict) -> None:
         """Creates a text file and saves the result as an HTML document.
 
+        With page_size, creates an index page and page files instead (see _save_pages).
+        With cache, downloads thumbnails and fonts first (see _prepare_offline).
+
         :param filename: "path/to/file.html", args.save value
         :param output: result of feed parsing, created by the Output.generate_output
         :return: None
         """
+        if self.cache:
+            self._prepare_offline(filename, output)
+        if self.page_size:
+            self._save_pages(filename, output)
+            return
         ids = output["feeds"].keys()
         with open(filename, 'w', encoding='utf-8') as f:
-            html_ids = [f'yt-id{index}' for index, yt_id in enumerate(ids)]
-            f.write(f'{html_begin}\n')
+            f.write(f'{self._html_begin}\n')
             f.write("<h1>Feeds</h1>\n")
             f.write(f'<div class="yt-ids"><p>Created (UTC): {output["created_utc"]}</p>')
             f.write('<div>Youtube IDs:</div>')
-            for html_id, yt_id in zip(html_ids, ids):
-                f.write(f'<div><a href="#{html_id}">{yt_id}</a></div>')
+            f.write(''.join(f'<div><a href="#yt-id{index}">{yt_id}</a></div>' for index, yt_id in enumerate(ids)))
             f.write('</div><br>\n')  # close yt-ids
+            links = {yt_id: f'#yt-id{index}' for index, yt_id in enumerate(ids)}
+            for index, (k, v) in enumerate(output["feeds"].items()):
+                f.write(self._feed_block(f'yt-id{index}', k, v, slider_block, links))
+            f.write(html_end)
 
-            # feed info: CHANNEL FEED, PLAYLIST FEED
-            for k, v in output["feeds"].items():
-                f.write(f'<h2 id="{html_ids.pop(0)}">{k}</h2>\n')
-                verbose = len(v["feed_info"]) > 3
-                if v["feed_info"]:
-                    f.write(f'<div class="feed-info"><div>feed type: {v["feed_info"]["feed_type"]}</div>')
-                    f.write(f'<div>feed title: {v["feed_info"]["feed_title"]}</div>')
-                    if v["feed_info"].get("channel_title"):
-                        f.write(f'<div>channel title: {v["feed_info"]["channel_title"]}</div>')
-                        if verbose:
-                            f.write(f'<div>channel url: <a href="{v["feed_info"]["channel_url"]}" target="_blank" '
-                                    f'rel="noopener noreferrer nofollow">{v["feed_info"]["channel_url"]}</a></div>')
-                            f.write(f'<div>channel created: {v["feed_info"]["channel_created"]}</div>')
-                    if v["feed_info"].get("playlist_created_by"):
-                        f.write(f'<div>playlist created by: {v["feed_info"]["playlist_created_by"]}</div>')
-                        if verbose:
-                            f.write(f'<div>playlist creator url: <a href="{v["feed_info"]["playlist_creator_url"]}" '
-                                    'target="_blank" rel="noopener noreferrer nofollow">'
-                                    f'{v["feed_info"]["playlist_creator_url"]}</a></div>')
-                            f.write(f'<div>playlist created: {v["feed_info"]["playlist_created"]}</div>')
-                    f.write('</div><br>\n')  # close feed-info
-                if v["entries"]:
-                    for entry in v["entries"]:
-                        # video block:
-                        # thumbnail, video url (buttons), video title, published, views, likes, description
-                        f.write('<div class="video-block">\n')
-                        # thumbnail
-                        # In xml - https://i[number].ytimg.com/vi/VIDEO_ID/hqdefault.jpg (480x360).
-                        # hqdefault.jpg - this is a thumbnail, or the first frame of the video.
-                        # frames used in html: hqdefault.jpg, hq1.jpg, hq2.jpg, hq3.jpg
-                        if entry["video_url"].startswith("https://www.youtube.com/shorts/"):
-                            video_id = entry["video_url"].split("https://www.youtube.com/shorts/")[1]
-                        else:
-                            video_id = entry["video_url"].split("https://www.youtube.com/watch?v=")[1]
-                        f.write(slider_block.format(video_id=video_id))
-                        # url
-                        f.write(buttons_block.format(video_url=entry["video_url"]))
-                        # title
-                        f.write(f'<div class="video-title">{entry["video_title"]}</div>\n')
-                        # published
-                        f.write(f'<div>published: {entry["published"]}</div>')
-                        if verbose:
-                            # views
-                            f.write(f'\n<div>views: {entry["views"]}</div>')
-                            # likes
-                            f.write(f'<div>likes: {entry["likes"]}</div>\n')
-                            # description
-                            if entry["description"] == 'No description':
-                                f.write(f'<div>description: {entry["description"]}</div>')
-                            else:
-                                f.write(
-                                    '<div class="description-popup" onclick="showPopup(event)">show/hide description'
-                                    f'<span class="popup-text">{entry["description"]}</span></div>')
-                        f.write('<br></div>\n')  # close video-block
-                # There are no uploads in the feed.
-                if v.get("info_message"):
-                    f.write(f'<div class="no-uploads">{v["info_message"]}</div><br>\n')
-                # 'Failed to get data from: ', 'Failed to get channel id UCxxx for: ', 'Failed to get feed from: '
-                if v.get("error_message"):
-                    u = v["error_message"].partition(": ")
-                    f.write(f'<div class="no-data">{u[0]}: <a href="{u[2]}" '
-                            f'target="_blank" rel="noopener noreferrer nofollow">{u[2]}</a></div><br>\n')
+    def _save_pages(self, filename: str, output: dict) -> None:
+        """Creates a scalable report.
+
+        filename - index page with links to all IDs,
+        page files - page_size feeds per page, one thumbnail frame per video is loaded
+        when scrolled into view, the other frames on hover.
+
+        :param filename: "path/to/file.html", args.save value
+        :param output: result of feed parsing, created by the Output.generate_output
+        :return: None
+        """
+        ids = list(output["feeds"].keys())
+        pages = self.number_of_pages(len(ids), self.page_size)
+        page_names = [os.path.basename(self.page_filename(filename, page)) for page in range(1, pages + 1)]
+        index_name = os.path.basename(filename)
+        links = {yt_id: f'{page_names[index // self.page_size]}#yt-id{index}' for index, yt_id in enumerate(ids)}
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f'{self._html_begin}\n')
+            f.write("<h1>Feeds</h1>\n")
+            f.write(f'<div class="yt-ids"><p>Created (UTC): {output["created_utc"]}</p>')
+            f.write(f'<div>Pages: {pages}</div>')
+            f.write('<div>Youtube IDs:</div>')
+            f.write(''.join(f'<div><a href="{links[yt_id]}">{yt_id}</a></div>' for yt_id in ids))
+            f.write('</div><br>\n')  # close yt-ids
             f.write(html_end)
+        for page in range(pages):
+            start = page * self.page_size
+            nav_links = [f'<a href="{index_name}">index</a>']
+            if page > 0:
+                nav_links.append(f'<a href="{page_names[page - 1]}">previous</a>')
+            nav_links.append(f'page {page + 1} of {pages}')
+            if page < pages - 1:
+                nav_links.append(f'<a href="{page_names[page + 1]}">next</a>')
+            navigation = pages_block.format(links=' | '.join(nav_links))
+            with open(self.page_filename(filename, page + 1), 'w', encoding='utf-8') as f:
+                f.write(f'{self._html_begin}\n')
+                f.write(f'<h1>Feeds ({page + 1}/{pages})</h1>\n')
+                f.write(navigation)
+                for index in range(start, min(start + self.page_size, len(ids))):
+                    f.write(self._feed_block(f'yt-id{index}', ids[index], output["feeds"][ids[index]],
+                                             lazy_slider_block, links))
+                f.write(navigation)
+                f.write(html_end)
 
 
 class JSONFormat:
@@ -276,3 +627,92 @@ class JSONFormat:
         """
         with open(filename, 'w', encoding='utf-8') as f:
             dump(output, f, indent=2)
+
+
+class NDJSONFormat:
+    """Newline-delimited JSON, one compact JSON object per feed or per feed entry.
+
+    Records are written as soon as a feed is processed (see write_feed),
+    so the output can be piped into other tools while the CLI is running.
+
+    Record per feed:
+        {"id": "...", "feed_info": {...}, "entries": [...], "error_message" or "info_message": "..."}
+    Record per entry:
+        {"id": "...", "feed_info": {...}, "entry": {...}}
+        {"id": "...", "feed_info": {...}, "entry": null, "error_message" or "info_message": "..."}
+    """
+    def __init__(self, per_entry: bool = False, compress: bool = False):
+        """
+        :param per_entry: one record per feed entry instead of one record per feed
+        :param compress: gzip the file written by save_to_file (always for *.gz files)
+        """
+        self.per_entry = per_entry
+        self.compress = compress
+        self._file = None
+        self._stream = None
+
+    def open(self, filename: Union[str, None] = None, compress: bool = False) -> 'NDJSONFormat':
+        """Open the output stream.
+
+        :param filename: "path/to/file.ndjson" or "path/to/file.ndjson.gz", None - stdout
+        :param compress: gzip the output (always for *.gz files)
+        :return: self, can be used as a context manager
+        """
+        if filename is None:
+            sys.stdout.flush()
+            raw = sys.stdout.buffer
+        else:
+            self._file = raw = open(filename, 'wb')
+            compress = compress or filename.endswith('.gz')
+        self._stream = gzip.GzipFile(fileobj=raw, mode='wb') if compress else raw
+        return self
+
+    def close(self) -> None:
+        if self._stream is None:
+            return
+        if isinstance(self._stream, gzip.GzipFile):
+            # writes the gzip trailer, the underlying file or stdout stays open
+            self._stream.close()
+        if self._file is not None:
+            self._file.close()
+        else:
+            sys.stdout.buffer.flush()
+        self._stream = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def records(self, yt_id: str, feed: dict) -> List[dict]:
+        """Convert a feed dict (see Output._create_base_dict) to records."""
+        if not self.per_entry:
+            return [{"id": yt_id, **feed}]
+        if feed["entries"]:
+            return [{"id": yt_id, "feed_info": feed["feed_info"], "entry": entry} for entry in feed["entries"]]
+        record = {"id": yt_id, "feed_info": feed["feed_info"], "entry": None}
+        record.update({k: v for k, v in feed.items() if k.endswith("_message")})
+        return [record]
+
+    def write_feed(self, yt_id: str, feed: dict) -> None:
+        """Write the records of a feed and flush them, used as Output.generate_output(on_feed=...).
+
+        :param yt_id: playlist id or channel id or @handle
+        :param feed: feed dict, see Output._create_base_dict
+        :return: None
+        """
+        lines = ''.join(dumps(record, separators=(',', ':')) + '\n' for record in self.records(yt_id, feed))
+        self._stream.write(lines.encode('utf-8'))
+        self._stream.flush()
+
+    def save_to_file(self, filename: str, output: dict) -> None:
+        """Creates a text file and saves the result as NDJSON.
+
+        :param filename: "path/to/file.ndjson" or "path/to/file.ndjson.gz", args.save value
+        :param output: result of feed parsing, created by the Output.generate_output
+        :return: None
+        """
+        with self.open(filename, compress=self.compress):
+            for yt_id, feed in output["feeds"].items():
+                self.write_feed(yt_id, feed)
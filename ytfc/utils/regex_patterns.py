@@ -20,3 +20,7 @@ OL_PATTERN = re.compile(music_list_pattern)
 # YouTube Music channel
 music_mix_pattern = '^RDCLAK5uy_[klmn]{1}[A-Za-z0-9_-]{32}$'
 RDCLAK_PATTERN = re.compile(music_mix_pattern)
+
+# font files in the Google Fonts stylesheet: src: url(https://fonts.gstatic.com/...) format('woff2');
+font_url_pattern = r'url\((https?://[^)\s]+)\)'
+FONT_URL_PATTERN = re.compile(font_url_pattern)
@@ -0,0 +1,292 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from json import dumps
+from typing import Union, List, Dict, Tuple
+from urllib.parse import urlparse, parse_qs, unquote
+
+import requests
+
+from ytfc.utils.cli_utils import check_ids
+from ytfc.utils.input_utils import select_feed
+from ytfc.utils.metrics_utils import cache_lookup, render, NOTIFICATIONS
+from ytfc.utils.notify_utils import VideoTracker, Notifier
+from ytfc.utils.output_utils import Output
+from ytfc.utils.request_utils import RequestBudget, ProxyPool
+
+
+class TTLCache:
+    """Thread-safe LRU cache, items expire after ttl seconds."""
+    def __init__(self, maxsize: int, ttl: float, name: str = 'cache'):
+        """
+        :param maxsize: maximum number of items, the least recently used items are removed
+        :param ttl: time to live of an item, seconds
+        :param name: name of the cache in the metrics
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str):
+        """Cached value or None (not cached or expired)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                cache_lookup(self.name, False, self.hits, self.misses)
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            cache_lookup(self.name, True, self.hits, self.misses)
+            return item[1]
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class CachedOutput(Output):
+    """Output that resolves @handles through the cache of the service."""
+    def __init__(self, ids: List[str], service: 'FeedService'):
+        super().__init__(ids, budget=service.budget, workers=service.workers)
+        self.service = service
+
+    def _fetch(self, channel_or_playlist_id: str) -> Tuple[Dict, Union[bytes, None], Union[str, None],
+                                                           Union[str, None]]:
+        # a failed feed (429, 5xx, connection error) is an error of the feed, not of the whole client request
+        try:
+            return super()._fetch(channel_or_playlist_id)
+        except requests.exceptions.RequestException as e:
+            feed = {"feed_info": {}, "entries": [], "error_message": f'Failed to get feed: {e}'}
+            return feed, None, None, None
+
+    def _resolve_handle(self, handle: str, feed: Dict) -> Tuple[Union[str, None], Union[str, None]]:
+        xml_url = self.service.handles.get(handle)
+        if xml_url is not None:
+            return xml_url, None
+        xml_url, error_msg = super()._resolve_handle(handle, feed)
+        if xml_url is not None:
+            self.service.handles.set(handle, xml_url)
+        return xml_url, error_msg
+
+
+class FeedService:
+    """Parsed feeds and resolved @handles kept in memory between requests to the server.
+
+    Feeds are parsed with verbose details and all entries,
+    --verbose and --number of a request are applied to the cached feed (see select_feed).
+    Feeds with errors are not cached.
+
+    New videos in the requested or polled feeds (see poll) are published to the notifier:
+    webhooks and /events subscribers.
+    """
+    def __init__(self, ttl: float = 300, maxsize: int = 10000, workers: int = 8,
+                 connect: float = 10, read: float = 30, proxies: Union[ProxyPool, None] = None,
+                 tracker: Union[VideoTracker, None] = None, notifier: Union[Notifier, None] = None):
+        """
+        :param ttl: time to live of the cached feeds and handles, seconds
+        :param maxsize: maximum number of cached feeds (and handles)
+        :param workers: number of feeds requested concurrently for a client request
+        :param connect: connect timeout of a request to YouTube, seconds
+        :param read: read timeout of a request to YouTube, seconds
+        :param proxies: proxies for the requests to YouTube or None
+        :param tracker: video IDs seen in the feeds (in memory if None)
+        :param notifier: delivery of new video events (only /events subscribers if None)
+        """
+        self.feeds = TTLCache(maxsize, ttl, 'feeds')
+        self.handles = TTLCache(maxsize, ttl, 'handles')
+        self.workers = workers
+        # keep-alive connections, timeouts skip the ID
+        self.budget = RequestBudget(connect=connect, read=read, concurrency=workers, proxies=proxies)
+        self.tracker = tracker or VideoTracker()
+        self.notifier = notifier or Notifier([])
+
+    def _request_feeds(self, ids: List[str]) -> Dict[str, Dict]:
+        """Request and cache the feeds, publish new videos.
+
+        :param ids: a list of validated IDs
+        :return: feed dicts by id
+        """
+        feeds = {}
+
+        def on_feed(yt_id, feed):
+            feeds[yt_id] = feed
+            if not feed.get("error_message"):
+                self.feeds.set(yt_id, feed)
+            self.notifier.publish(self.tracker.new_videos(yt_id, feed))
+
+        CachedOutput(ids, self).generate_output(verbose=True, number=None, no_print=True, save=False,
+                                                on_feed=on_feed)
+        return feeds
+
+    def poll(self, ids: List[str], interval: float, stop: threading.Event) -> None:
+        """Request the feeds every interval seconds to detect new videos, until stop is set.
+
+        :param ids: a list of validated IDs
+        :param interval: seconds between the starts of the polls
+        :param stop: event to stop polling
+        :return: None
+        """
+        while not stop.is_set():
+            start = time.monotonic()
+            try:
+                self._request_feeds(ids)
+                self.tracker.save(self.notifier.undelivered())
+            except Exception as e:
+                # the next poll is tried anyway, e.g. after 429 Too Many Requests
+                print(f'Polling failed. {e.__class__.__name__}: {e}')
+            stop.wait(max(0.0, interval - (time.monotonic() - start)))
+
+    def get_output(self, ids: List[str], verbose: bool, number: Union[int, None]) -> Dict:
+        """Results of feed parsing for the ids.
+
+        :param ids: a list of validated IDs
+        :param verbose: get more details about the feed and its entries
+        :param number: limit the number of entries for each feed (up to 15)
+        :return: output dict, see Output._create_base_dict
+        """
+        feeds = {yt_id: self.feeds.get(yt_id) for yt_id in ids}
+        missing = [yt_id for yt_id, feed in feeds.items() if feed is None]
+        if missing:
+            feeds.update(self._request_feeds(missing))
+        output = Output(ids)._create_base_dict()
+        output["feeds"] = {yt_id: select_feed(feeds[yt_id], verbose, number) for yt_id in ids}
+        return output
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /feeds?ids=ID,ID,...&verbose=1&number=5
+    GET /feeds/<ID>?verbose=1&number=5
+    GET /metrics
+    GET /events
+
+    Response: JSON, see Output._create_base_dict; /metrics - Prometheus text format, see metrics_utils;
+    /events - Server-Sent Events stream of new videos (event: video, data: see VideoTracker.new_videos)
+    Errors: {"error": "..."} with status 400 or 404, 502 if the feeds could not be requested
+    (a feed that fails alone has an "error_message" like in the output of the CLI)
+    """
+    service = None  # FeedService, set by run_server
+    # seconds between keep-alive comments of an idle /events stream
+    keep_alive = 15
+
+    def _send_json(self, status: int, data: Dict) -> None:
+        body = dumps(data, separators=(',', ':')).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self) -> None:
+        """Send new video events until the client disconnects."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        subscriber = self.service.notifier.subscribe()
+        try:
+            self.wfile.write(b': connected\n\n')
+            self.wfile.flush()
+            while True:
+                try:
+                    event_id, event = subscriber.get(timeout=self.keep_alive)
+                except queue.Empty:
+                    self.wfile.write(b': keep-alive\n\n')
+                    self.wfile.flush()
+                    continue
+                message = f'id: {event_id}\nevent: video\ndata: {dumps(event, separators=(",", ":"))}\n\n'
+                self.wfile.write(message.encode('utf-8'))
+                self.wfile.flush()
+                NOTIFICATIONS.inc('sse', 'delivered')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.service.notifier.unsubscribe(subscriber)
+            self.close_connection = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path == '/metrics':
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if url.path == '/events':
+            self._stream_events()
+            return
+        if url.path == '/feeds':
+            ids = [i for value in query.get('ids', []) for i in value.split(',') if i]
+        elif url.path.startswith('/feeds/'):
+            ids = [unquote(url.path[len('/feeds/'):])]
+        else:
+            self._send_json(404, {"error": f'Not found: {url.path}. Use /feeds?ids=..., /feeds/<id>, /metrics or /events.'})
+            return
+        if not ids:
+            self._send_json(400, {"error": 'No IDs. Use /feeds?ids=ID,ID,...'})
+            return
+        invalid_ids, yt_ids = check_ids(ids, None)
+        if invalid_ids:
+            self._send_json(400, {"error": f'Unsupported id(s): {", ".join(invalid_ids)}.'})
+            return
+        verbose = query.get('verbose', ['0'])[0].lower() in ('1', 'true', 'yes')
+        number = query.get('number', [None])[0]
+        if number is not None:
+            if not number.isdigit() or not 1 <= int(number) <= 15:
+                self._send_json(400, {"error": f'Invalid number: {number}. It must be from 1 to 15.'})
+                return
+            number = int(number)
+        try:
+            output = self.service.get_output(yt_ids, verbose, number)
+        except Exception as e:
+            self._send_json(502, {"error": f'Failed to get feeds: {e}'})
+            return
+        self._send_json(200, output)
+
+
+def run_server(host: str, port: int, service: FeedService, poll_ids: Union[List[str], None] = None,
+               poll_interval: float = 300) -> None:
+    """Serve the feeds until the process is interrupted.
+
+    :param host: address of the server, e.g. 127.0.0.1
+    :param port: port of the server, 0 - any free port
+    :param service: feed service with caches
+    :param poll_ids: IDs requested in the background to detect new videos (see FeedService.poll) or None
+    :param poll_interval: seconds between the polls
+    :return: None
+    """
+    handler = type('Handler', (FeedRequestHandler,), {'service': service})
+    stop = threading.Event()
+    with ThreadingHTTPServer((host, port), handler) as server:
+        server.daemon_threads = True
+        if poll_ids:
+            threading.Thread(target=service.poll, args=(poll_ids, poll_interval, stop), daemon=True).start()
+            print(f'Polling {len(poll_ids)} feed(s) every {poll_interval:g} seconds.')
+        print(f'Serving feeds on http://{server.server_address[0]}:{server.server_address[1]}/feeds '
+              '(press Ctrl+C to stop).')
+        try:
+            server.serve_forever()
+        finally:
+            stop.set()
+            # queued events are delivered before the exit
+            service.notifier.close(timeout=10)
+            service.tracker.save(service.notifier.undelivered())
@@ -1,3 +1,10 @@
+import os
+
+
+# Base URL of the requested pages and feeds.
+# A local stand-in server can be used instead of YouTube (see loadtest/fake_youtube.py).
+YOUTUBE_URL = os.environ.get('YTFC_YOUTUBE_URL', 'https://www.youtube.com').rstrip('/')
+
 FEED_ITEMS = {
     # root.find()
     'request_url': '{http://www.w3.org/2005/Atom}link',
@@ -13,8 +20,27 @@ FEED_ITEMS = {
     'video_title': '{http://www.w3.org/2005/Atom}title',
     'video_link': '{http://www.w3.org/2005/Atom}link',
     'video_published': '{http://www.w3.org/2005/Atom}published',
+    # uploader of a video of a playlist
+    'video_channel_id': '{http://www.youtube.com/xml/schemas/2015}channelId',
+    'video_author': '{http://www.w3.org/2005/Atom}author/{http://www.w3.org/2005/Atom}name',
     # description of the video may or may not be
     'video_description': '{http://search.yahoo.com/mrss/}group/{http://search.yahoo.com/mrss/}description',
     'video_likes': '{http://search.yahoo.com/mrss/}group/{http://search.yahoo.com/mrss/}community/{http://search.yahoo.com/mrss/}starRating',
     'video_views': '{http://search.yahoo.com/mrss/}group/{http://search.yahoo.com/mrss/}community/{http://search.yahoo.com/mrss/}statistics'
 }
+
+# In xml - https://i[number].ytimg.com/vi/VIDEO_ID/hqdefault.jpg (480x360).
+# hqdefault.jpg - this is a thumbnail, or the first frame of the video.
+# A local stand-in server can be used instead of i.ytimg.com (see loadtest/fake_youtube.py).
+THUMBNAIL_URL = os.environ.get('YTFC_THUMBNAIL_URL', 'https://i.ytimg.com').rstrip('/') + '/vi/{video_id}/{frame}'
+THUMBNAIL_FRAMES = ('hqdefault.jpg', 'hq1.jpg', 'hq2.jpg', 'hq3.jpg')
+
+# --metrics-file is rewritten at least every METRICS_INTERVAL seconds during a run
+METRICS_INTERVAL = 15
+
+# --checkpoint is synced to disk at least every CHECKPOINT_FSYNC_INTERVAL seconds
+CHECKPOINT_FSYNC_INTERVAL = 5
+
+# at the end of a run, queued --webhook events are delivered for at most NOTIFY_CLOSE_TIMEOUT seconds,
+# the events that are not delivered are sent again by the next run
+NOTIFY_CLOSE_TIMEOUT = 60
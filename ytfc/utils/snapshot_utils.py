@@ -0,0 +1,383 @@
+import json
+import os
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Union
+
+try:
+    import numpy
+except ImportError:  # optional, see ytfc stats
+    numpy = None
+
+from ytfc.utils.xml_utils import get_video_id
+
+
+# column files: name -> array typecode (numpy dtype: NUMPY_TYPES)
+# rows: one row per video per snapshot; videos: one row per video (the video number of rows.video)
+ROW_COLUMNS = {'rows.video': 'I', 'rows.time': 'q', 'rows.views': 'q', 'rows.likes': 'q'}
+VIDEO_COLUMNS = {'videos.channel': 'I', 'videos.published': 'q'}
+NUMPY_TYPES = {'I': 'u4', 'q': 'i8'}
+# videos.id: video IDs, 11 ASCII characters each
+VIDEO_ID_SIZE = 11
+DAY = 86400
+
+
+def to_timestamp(value: str) -> int:
+    """Seconds since the epoch of an ISO 8601 date, e.g. 2024-01-01T12:00:00+00:00, -1 if it is not a date."""
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return -1
+
+
+class SnapshotStore:
+    """Columnar store of the views and likes of videos over time (--snapshots, ytfc stats).
+
+    Each run appends a snapshot: a row (video number, time, views, likes) per entry of a --verbose feed.
+    The columns are binary files of fixed-size numbers, so they are read into arrays without parsing:
+        rows.video, rows.time, rows.views, rows.likes - one value per row
+        videos.id, videos.channel, videos.published - one value per video (rows.video is the position)
+        meta.json - number of committed rows and videos, channels [[channel url, channel title], ...]
+
+    Rows are appended to the column files when the store is closed (or every batch_size feeds),
+    then meta.json is replaced. Data written after the last meta.json (a killed run) is truncated on open.
+    """
+    def __init__(self, path: str, batch_size: int = 1000):
+        """
+        :param path: "path/to/snapshots" directory, created if it does not exist
+        :param batch_size: feeds per commit
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.rows = 0
+        self.added = 0
+        self.channels = []
+        self._channel_numbers = {}
+        self._video_numbers = {}
+        self._pending = 0
+        self._buffers = {}
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def open(self) -> 'SnapshotStore':
+        """Load the video and channel numbers, discard data that was not committed.
+
+        :return: self, can be used as a context manager
+        """
+        os.makedirs(self.path, exist_ok=True)
+        meta = load_meta(self.path)
+        self.rows = meta["rows"]
+        self.channels = meta["channels"]
+        self._channel_numbers = {c[0]: n for n, c in enumerate(self.channels)}
+        sizes = {**{name: self.rows * array(t).itemsize for name, t in ROW_COLUMNS.items()},
+                 **{name: meta["videos"] * array(t).itemsize for name, t in VIDEO_COLUMNS.items()},
+                 'videos.id': meta["videos"] * VIDEO_ID_SIZE}
+        for name, size in sizes.items():
+            with open(self._file(name), 'ab') as f:
+                f.truncate(size)
+        with open(self._file('videos.id'), 'rb') as f:
+            ids = f.read()
+        self._video_numbers = {ids[i:i + VIDEO_ID_SIZE].decode('ascii'): n
+                               for n, i in enumerate(range(0, len(ids), VIDEO_ID_SIZE))}
+        self._buffers = {name: array(t) for name, t in {**ROW_COLUMNS, **VIDEO_COLUMNS}.items()}
+        self._buffers['videos.id'] = bytearray()
+        return self
+
+    def close(self) -> None:
+        if self._buffers:
+            self.commit()
+            self._buffers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_feed(self, yt_id: str, feed: Dict, timestamp: Union[int, None] = None) -> None:
+        """Add the views and likes of the entries of a feed, used as Output.generate_output(on_feed=...).
+
+        :param yt_id: playlist id or channel id or @handle
+        :param feed: feed dict (--verbose), see Output._create_base_dict, feeds with errors are skipped
+        :param timestamp: time of the snapshot, seconds since the epoch, None - now
+        :return: None
+        """
+        if feed.get("error_message"):
+            return
+        feed_info = feed["feed_info"]
+        feed_channel = (feed_info.get("channel_url") or feed_info.get("playlist_creator_url") or yt_id,
+                        feed_info.get("channel_title") or feed_info.get("playlist_created_by"))
+        timestamp = int(time.time()) if timestamp is None else timestamp
+        b = self._buffers
+        for entry in feed["entries"]:
+            # references to other feeds (--dedupe) are added with the first feed
+            if "duplicate_of" in entry:
+                continue
+            video_id = get_video_id(entry["video_url"])
+            try:
+                views, likes = int(entry["views"]), int(entry["likes"])
+            except (KeyError, ValueError):
+                continue
+            if len(video_id) != VIDEO_ID_SIZE:
+                continue
+            video = self._video_numbers.get(video_id)
+            if video is None:
+                video = self._video_numbers[video_id] = len(self._video_numbers)
+                # the uploader of a video of a playlist, not the creator of the playlist
+                if entry.get("uploader_url"):
+                    channel = self._channel(entry["uploader_url"], entry.get("uploaded_by"))
+                else:
+                    channel = self._channel(*feed_channel)
+                b['videos.id'] += video_id.encode('ascii')
+                b['videos.channel'].append(channel)
+                b['videos.published'].append(to_timestamp(entry.get("published")))
+            b['rows.video'].append(video)
+            b['rows.time'].append(timestamp)
+            b['rows.views'].append(views)
+            b['rows.likes'].append(likes)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.commit()
+
+    def _channel(self, url: str, title: Union[str, None]) -> int:
+        """Number of a channel, a new channel is added to meta.json with the next commit."""
+        channel = self._channel_numbers.get(url)
+        if channel is None:
+            channel = self._channel_numbers[url] = len(self.channels)
+            self.channels.append([url, title])
+        return channel
+
+    def commit(self) -> None:
+        """Append the buffered rows to the column files and record the new number of rows."""
+        rows = len(self._buffers['rows.video'])
+        for name, buffer in self._buffers.items():
+            if buffer:
+                with open(self._file(name), 'ab') as f:
+                    f.write(buffer if isinstance(buffer, bytearray) else buffer.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                del buffer[:]
+        self.rows += rows
+        self.added += rows
+        self._pending = 0
+        tmp_path = self._file('meta.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"rows": self.rows, "videos": len(self._video_numbers), "channels": self.channels}, f,
+                      ensure_ascii=False)
+        os.replace(tmp_path, self._file('meta.json'))
+
+    def report(self) -> str:
+        return f'Snapshots {self.path}: {self.added} row(s) added, {self.rows} row(s) ' \
+               f'of {len(self._video_numbers)} video(s) in total.'
+
+
+def load_meta(path: str) -> Dict:
+    """meta.json of a snapshot store, an empty store if it does not exist."""
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.isfile(meta_path):
+        return {"rows": 0, "videos": 0, "channels": []}
+    with open(meta_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_columns(path: str) -> Dict:
+    """Read the committed columns of a snapshot store.
+
+    :param path: "path/to/snapshots" directory
+    :return: {"rows.video": ..., ..., "videos.id": [str, ...], "channels": [[url, title], ...]},
+             the numeric columns are numpy arrays if numpy is installed, otherwise array.array,
+             empty columns if nothing is committed (a new or empty directory)
+    """
+    meta = load_meta(path)
+    columns = {"channels": meta["channels"]}
+    for names, count in ((ROW_COLUMNS, meta["rows"]), (VIDEO_COLUMNS, meta["videos"])):
+        for name, typecode in names.items():
+            file_path = os.path.join(path, name)
+            if not count or not os.path.isfile(file_path):
+                count = 0
+            if numpy is not None:
+                columns[name] = numpy.fromfile(file_path, dtype=NUMPY_TYPES[typecode], count=count) \
+                    if count else numpy.array([], dtype=NUMPY_TYPES[typecode])
+            else:
+                columns[name] = array(typecode)
+                if count:
+                    with open(file_path, 'rb') as f:
+                        columns[name].fromfile(f, count)
+    ids = ''
+    if meta["videos"] and os.path.isfile(os.path.join(path, 'videos.id')):
+        with open(os.path.join(path, 'videos.id'), 'rb') as f:
+            ids = f.read(meta["videos"] * VIDEO_ID_SIZE).decode('ascii')
+    columns["videos.id"] = [ids[i:i + VIDEO_ID_SIZE] for i in range(0, len(ids), VIDEO_ID_SIZE)]
+    return columns
+
+
+def _video_changes_numpy(c: Dict, start: int) -> Dict:
+    """First and last snapshot of each video since start, vectorized with numpy."""
+    mask = c["rows.time"] >= start
+    video, t = c["rows.video"][mask], c["rows.time"][mask]
+    views, likes = c["rows.views"][mask], c["rows.likes"][mask]
+    # rows of a video together, ordered by time
+    order = numpy.lexsort((t, video))
+    video, t, views, likes = video[order], t[order], views[order], likes[order]
+    first = numpy.flatnonzero(numpy.r_[True, video[1:] != video[:-1]]) if len(video) else numpy.array([], int)
+    last = numpy.r_[first[1:] - 1, len(video) - 1] if len(first) else first
+    return {"rows": len(video), "video": video[first], "snapshots": last - first + 1,
+            "t0": t[first], "t1": t[last], "views0": views[first], "views1": views[last],
+            "likes0": likes[first], "likes1": likes[last]}
+
+
+def _video_changes_python(c: Dict, start: int) -> Dict:
+    """First and last snapshot of each video since start, one pass over the rows."""
+    changes = {}
+    rows = 0
+    for video, t, views, likes in zip(c["rows.video"], c["rows.time"], c["rows.views"], c["rows.likes"]):
+        if t < start:
+            continue
+        rows += 1
+        item = changes.get(video)
+        if item is None:
+            changes[video] = [1, t, t, views, views, likes, likes]
+            continue
+        item[0] += 1
+        if t < item[1]:
+            item[1], item[3], item[5] = t, views, likes
+        if t >= item[2]:
+            item[2], item[4], item[6] = t, views, likes
+    videos = sorted(changes)
+    keys = ("snapshots", "t0", "t1", "views0", "views1", "likes0", "likes1")
+    result = {"rows": rows, "video": videos}
+    for i, key in enumerate(keys):
+        result[key] = [changes[v][i] for v in videos]
+    return result
+
+
+def compute_stats(c: Dict, days: Union[float, None] = None, top: int = 10) -> Dict:
+    """Per-video and per-channel aggregates of the snapshots.
+
+    Video: views and likes gained between the first and the last snapshot, view velocity (views per day).
+    Channel: videos, uploads per week (from the publication dates of its videos), views of the last
+    snapshots, views gained and view velocity (sum over its videos).
+
+    :param c: columns, see load_columns
+    :param days: only the snapshots of the last N days (before the latest snapshot), None - all
+    :param top: number of videos (top movers: most views gained) and channels (highest view velocity)
+    :return: {"rows", "videos", "channels", "from", "to", "top_videos": [...], "top_channels": [...]}
+    """
+    times = c["rows.time"]
+    if not len(times):
+        return {"rows": 0, "videos": 0, "channels": 0, "from": None, "to": None,
+                "top_videos": [], "top_channels": []}
+    latest = int(max(times))
+    start = latest - int(days * DAY) if days else int(min(times))
+    if numpy is not None:
+        v = _video_changes_numpy(c, start)
+        video = v["video"]
+        span = (v["t1"] - v["t0"]) / DAY
+        gained = v["views1"] - v["views0"]
+        # a video with one snapshot in the window has no velocity
+        velocity = numpy.divide(gained, span, out=numpy.zeros(len(span)), where=span > 0)
+        channel = c["videos.channel"][video]
+        published = c["videos.published"][video]
+        n_channels = len(c["channels"])
+        channel_videos = numpy.bincount(channel, minlength=n_channels)
+        channel_views = numpy.bincount(channel, weights=v["views1"], minlength=n_channels)
+        channel_gained = numpy.bincount(channel, weights=gained, minlength=n_channels)
+        channel_velocity = numpy.bincount(channel, weights=velocity, minlength=n_channels)
+        known = published >= 0
+        first_upload = numpy.full(n_channels, numpy.iinfo('i8').max)
+        last_upload = numpy.full(n_channels, -1)
+        numpy.minimum.at(first_upload, channel[known], published[known])
+        numpy.maximum.at(last_upload, channel[known], published[known])
+        uploads = numpy.bincount(channel[known], minlength=n_channels)
+        movers = numpy.argsort(-gained, kind='stable')[:top]
+        leaders = numpy.argsort(-channel_velocity, kind='stable')[:top]
+        leaders = [int(i) for i in leaders if channel_videos[i]]
+        active_channels = int(numpy.count_nonzero(channel_videos))
+    else:
+        v = _video_changes_python(c, start)
+        video = v["video"]
+        span = [(t1 - t0) / DAY for t0, t1 in zip(v["t0"], v["t1"])]
+        gained = [b - a for a, b in zip(v["views0"], v["views1"])]
+        velocity = [g / s if s > 0 else 0.0 for g, s in zip(gained, span)]
+        n_channels = len(c["channels"])
+        channel_videos, channel_views = [0] * n_channels, [0] * n_channels
+        channel_gained, channel_velocity = [0] * n_channels, [0.0] * n_channels
+        first_upload, last_upload, uploads = [2 ** 63 - 1] * n_channels, [-1] * n_channels, [0] * n_channels
+        for i, number in enumerate(video):
+            ch = c["videos.channel"][number]
+            channel_videos[ch] += 1
+            channel_views[ch] += v["views1"][i]
+            channel_gained[ch] += gained[i]
+            channel_velocity[ch] += velocity[i]
+            published = c["videos.published"][number]
+            if published >= 0:
+                uploads[ch] += 1
+                first_upload[ch] = min(first_upload[ch], published)
+                last_upload[ch] = max(last_upload[ch], published)
+        movers = sorted(range(len(video)), key=lambda i: -gained[i])[:top]
+        leaders = sorted(range(n_channels), key=lambda i: -channel_velocity[i])[:top]
+        leaders = [i for i in leaders if channel_videos[i]]
+        active_channels = sum(1 for n in channel_videos if n)
+
+    top_videos = []
+    for i in movers:
+        number = int(video[i])
+        views0 = int(v["views0"][i])
+        top_videos.append({
+            "video_id": c["videos.id"][number],
+            "channel": c["channels"][c["videos.channel"][number]][1],
+            "snapshots": int(v["snapshots"][i]),
+            "views": int(v["views1"][i]),
+            "views_gained": int(gained[i]),
+            "views_growth": round(int(gained[i]) / views0, 4) if views0 else None,
+            "views_per_day": round(float(velocity[i]), 1),
+            "likes_gained": int(v["likes1"][i] - v["likes0"][i])
+        })
+    top_channels = []
+    for i in leaders:
+        weeks = (int(last_upload[i]) - int(first_upload[i])) / (7 * DAY) if uploads[i] > 1 else 0
+        top_channels.append({
+            "channel": c["channels"][i][1],
+            "channel_url": c["channels"][i][0],
+            "videos": int(channel_videos[i]),
+            "uploads_per_week": round((int(uploads[i]) - 1) / weeks, 2) if weeks > 0 else None,
+            "views": int(channel_views[i]),
+            "views_gained": int(channel_gained[i]),
+            "views_per_day": round(float(channel_velocity[i]), 1)
+        })
+    return {
+        "rows": v["rows"],
+        "videos": len(video),
+        "channels": active_channels,
+        "from": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+        "to": datetime.fromtimestamp(latest, timezone.utc).isoformat(),
+        "top_videos": top_videos,
+        "top_channels": top_channels
+    }
+
+
+def format_stats(stats: Dict) -> str:
+    """Text of the aggregates for ytfc stats."""
+    lines = [f'Snapshots from {stats["from"]} to {stats["to"]}: {stats["rows"]} row(s), '
+             f'{stats["videos"]} video(s), {stats["channels"]} channel(s).', '', 'Top movers (views gained):']
+    for n, item in enumerate(stats["top_videos"], start=1):
+        growth = f' ({item["views_growth"]:+.1%})' if item["views_growth"] is not None else ''
+        lines.append(f'{n:>3}. +{item["views_gained"]:,} views{growth}, {item["views_per_day"]:,.1f}/day, '
+                     f'+{item["likes_gained"]:,} likes, {item["snapshots"]} snapshot(s)')
+        lines.append(f'     https://www.youtube.com/watch?v={item["video_id"]} - {item["channel"]}')
+    lines.extend(['', 'Channels (views per day):'])
+    for n, item in enumerate(stats["top_channels"], start=1):
+        cadence = f'{item["uploads_per_week"]:.2f}' if item["uploads_per_week"] is not None else '-'
+        lines.append(f'{n:>3}. {item["channel"]} - {item["views_per_day"]:,.1f} views/day, '
+                     f'+{item["views_gained"]:,} views, {item["views"]:,} views of {item["videos"]} video(s), '
+                     f'{cadence} uploads/week')
+        lines.append(f'     {item["channel_url"]}')
+    return '\n'.join(lines)
+
+
+def backend() -> str:
+    """Array backend of ytfc stats."""
+    return 'numpy' if numpy is not None else 'array (install numpy for faster stats)'
+
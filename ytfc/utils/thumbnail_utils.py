@@ -0,0 +1,177 @@
+import base64
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from typing import Union, List, Dict
+from urllib.parse import urlparse
+
+import requests
+
+from ytfc.utils.metrics_utils import cache_lookup
+from ytfc.utils.regex_patterns import FONT_URL_PATTERN
+from ytfc.utils.settings import THUMBNAIL_URL
+
+
+FONT_TYPES = {'.woff2': 'font/woff2', '.woff': 'font/woff', '.ttf': 'font/ttf', '.otf': 'font/otf'}
+
+
+class ThumbnailCache:
+    """Local content-addressed cache of thumbnails and fonts, shared across runs.
+
+    <directory>/index.json - url: object name
+    <directory>/objects/<2 characters>/<sha256 of the content><extension>
+
+    Identical files (e.g. the same placeholder image for different urls) are stored once.
+    When the cache is larger than max_bytes, the least recently used objects are removed
+    (see evict), except the objects used in the current run.
+    """
+    def __init__(self, directory: str, max_bytes: int, workers: int = 16, thumbnail_url: str = THUMBNAIL_URL):
+        """
+        :param directory: cache directory, created if it does not exist
+        :param max_bytes: maximum size of the cached objects
+        :param workers: number of concurrent downloads
+        :param thumbnail_url: url template with {video_id} and {frame} (a local server can be used for tests)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.thumbnail_url = thumbnail_url
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+        self._index_path = os.path.join(directory, 'index.json')
+        self.index = {}
+        if os.path.isfile(self._index_path):
+            with open(self._index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._lock = threading.Lock()
+        self._used = set()
+        self.hits = 0
+        self.downloaded = 0
+        self.failed = 0
+
+    def _object_path(self, name: str) -> str:
+        return os.path.join(self.directory, 'objects', name[:2], name)
+
+    def _store(self, url: str, content: bytes) -> str:
+        name = sha256(content).hexdigest() + os.path.splitext(urlparse(url).path)[1]
+        path = self._object_path(name)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # concurrent downloads of the same content write the same file
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        self.index[url] = name
+        return path
+
+    def get(self, url: str) -> Union[str, None]:
+        """Path to the cached file, downloads the file if it is not in the cache.
+
+        :param url: thumbnail or font url
+        :return: local path or None (not available)
+        """
+        name = self.index.get(url)
+        if name is not None and os.path.isfile(self._object_path(name)):
+            path = self._object_path(name)
+            os.utime(path)  # recently used
+            with self._lock:
+                self.hits += 1
+                self._used.add(path)
+                cache_lookup('thumbnails', True, self.hits, self.downloaded + self.failed)
+            return path
+        try:
+            r = self.session.get(url, timeout=(5, 30))
+        except requests.exceptions.RequestException:
+            r = None
+        if r is None or r.status_code != 200:
+            with self._lock:
+                self.failed += 1
+                cache_lookup('thumbnails', False, self.hits, self.downloaded + self.failed)
+            return None
+        path = self._store(url, r.content)
+        with self._lock:
+            self.downloaded += 1
+            self._used.add(path)
+            cache_lookup('thumbnails', False, self.hits, self.downloaded + self.failed)
+        return path
+
+    def fetch_all(self, urls: List[str]) -> Dict[str, Union[str, None]]:
+        """Concurrent downloads of the files that are not in the cache.
+
+        :param urls: thumbnail urls
+        :return: dict url: local path or None
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            paths = dict(zip(urls, executor.map(self.get, urls)))
+        self.save()
+        return paths
+
+    def inline_fonts(self, css_url: str) -> Union[str, None]:
+        """Get the font stylesheet with font files embedded as data URIs.
+
+        :param css_url: stylesheet url, html_template.fonts_url
+        :return: CSS or None (not available)
+        """
+        css_path = self.get(css_url)
+        if css_path is None:
+            return None
+        with open(css_path, encoding='utf-8') as f:
+            css = f.read()
+
+        def data_uri(match):
+            font_path = self.get(match.group(1))
+            if font_path is None:
+                return match.group(0)
+            font_type = FONT_TYPES.get(os.path.splitext(font_path)[1], 'application/octet-stream')
+            with open(font_path, 'rb') as font:
+                return f'url(data:{font_type};base64,{base64.b64encode(font.read()).decode("ascii")})'
+
+        css = FONT_URL_PATTERN.sub(data_uri, css)
+        self.save()
+        return css
+
+    def evict(self) -> int:
+        """Remove the least recently used objects until the cache size is within max_bytes.
+
+        :return: number of removed objects
+        """
+        objects = []
+        total = 0
+        objects_dir = os.path.join(self.directory, 'objects')
+        for prefix in os.scandir(objects_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                stat = entry.stat()
+                objects.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        removed = set()
+        for mtime, size, path in sorted(objects):
+            if total <= self.max_bytes:
+                break
+            if path in self._used:
+                continue
+            os.remove(path)
+            removed.add(os.path.basename(path))
+            total -= size
+        if removed:
+            self.index = {url: name for url, name in self.index.items() if name not in removed}
+            self.save()
+        return len(removed)
+
+    def save(self) -> None:
+        with self._lock:
+            tmp_path = f'{self._index_path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self._index_path)
+
+    def report(self) -> str:
+        return f'Thumbnails and fonts: {self.hits} from the cache, {self.downloaded} downloaded, ' \
+               f'{self.failed} not available.'
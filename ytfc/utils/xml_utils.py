@@ -6,6 +6,17 @@ from ytfc.utils.decorators import lxml_exceptions
 from ytfc.utils.settings import FEED_ITEMS
 
 
+def get_video_id(video_url: str) -> str:
+    """Get the video ID from the video url of a feed entry.
+
+    :param video_url: https://www.youtube.com/watch?v=VIDEO_ID or https://www.youtube.com/shorts/VIDEO_ID
+    :return: VIDEO_ID
+    """
+    if video_url.startswith("https://www.youtube.com/shorts/"):
+        return video_url.split("https://www.youtube.com/shorts/")[1]
+    return video_url.split("https://www.youtube.com/watch?v=")[1]
+
+
 class XMLHandler:
     def __init__(self):
         self.feed_items = FEED_ITEMS
@@ -91,7 +102,8 @@ class XMLHandler:
 
         Finds xml tags that contain entry data.
 
-        Feed entry: video title, video url, published, views, likes, description.
+        Feed entry: video title, video url, published, views, likes, description,
+        uploaded by and uploader url (videos of a playlist can be uploaded by other channels).
 
         If the xml response is unusual (AttributeError if root.find() is None) - CLI stops.
 
@@ -108,6 +120,7 @@ class XMLHandler:
         if not entries:  # empty list
             # 'There are no uploads in the feed.'
             return []
+        playlist = 'channel_id' not in root.find(self.feed_items['request_url']).get('href')
         entries_list = []
         for entry in entries:
             if verbose:
@@ -122,6 +135,11 @@ class XMLHandler:
                     "likes": f'{entry.find(self.feed_items["video_likes"]).get("count")}',
                     "description": f'{description}'
                 }
+                channel_id = entry.find(self.feed_items['video_channel_id'])
+                author = entry.find(self.feed_items['video_author'])
+                if playlist and channel_id is not None and author is not None:
+                    e["uploaded_by"] = f'{author.text}'
+                    e["uploader_url"] = f'https://www.youtube.com/channel/{channel_id.text}'
             else:
                 e = {
                     "video_title": f'{entry.find(self.feed_items["video_title"]).text}',